@@ -1,9 +1,11 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import uvicorn
+import anyio
 from loguru import logger
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional, Dict, Any
 import os
 from dotenv import load_dotenv
@@ -13,6 +15,13 @@ from src.services.audio_processing import AudioProcessingService
 from src.services.conversation_engine import ConversationEngine
 from src.services.tts_service import TTSService
 from src.services.wellness_calculator import WellnessCalculator
+from src.services.registry import (
+    get_emotion_service,
+    get_audio_service,
+    get_conversation_service,
+    get_tts_service,
+    get_wellness_service,
+)
 from src.models.schemas import (
     EmotionDetectionRequest,
     EmotionDetectionResponse,
@@ -60,25 +69,37 @@ async def startup_event():
     
     try:
         logger.info("Initializing AI services...")
-        
-        # Initialize services
-        emotion_service = EmotionDetectionService()
+
+        # Size the threadpool that serves sync endpoint offload; the models
+        # live in this process, so throughput comes from threads, not workers
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        limiter.total_tokens = int(os.getenv("THREADPOOL_SIZE", "40"))
+
+
+        # Initialize services; the registry hands back process-wide
+        # singletons so re-entrant startups never duplicate model memory
+        emotion_service = get_emotion_service()
         await emotion_service.initialize()
+        emotion_service.start_batch_scheduler()
         logger.info("✓ Emotion detection service initialized")
-        
-        audio_service = AudioProcessingService()
+
+        audio_service = get_audio_service()
         await audio_service.initialize()
+        audio_service.start_batch_scheduler()
+        # CPU-bound librosa analytics run in worker processes so they do
+        # not serialize concurrent requests on the GIL
+        audio_service.process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
         logger.info("✓ Audio processing service initialized")
         
-        conversation_service = ConversationEngine()
+        conversation_service = get_conversation_service()
         await conversation_service.initialize()
         logger.info("✓ Conversation engine initialized")
-        
-        tts_service = TTSService()
+
+        tts_service = get_tts_service()
         await tts_service.initialize()
         logger.info("✓ TTS service initialized")
-        
-        wellness_service = WellnessCalculator()
+
+        wellness_service = get_wellness_service()
         logger.info("✓ Wellness calculator initialized")
         
         logger.info("All AI services initialized successfully")
@@ -91,6 +112,14 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down AI services...")
+    if emotion_service:
+        await emotion_service.stop_batch_scheduler()
+    if audio_service:
+        await audio_service.stop_batch_scheduler()
+        if audio_service.process_pool:
+            audio_service.process_pool.shutdown(wait=False)
+    if tts_service:
+        await tts_service.shutdown()
 
 # Health check endpoints
 @app.get("/health", response_model=HealthResponse)
@@ -149,6 +178,37 @@ async def detect_emotion(request: EmotionDetectionRequest):
         logger.error(f"Emotion detection failed: {e}")
         raise HTTPException(status_code=500, detail=f"Emotion detection failed: {str(e)}")
 
+@app.post("/emotion/detect/binary", response_model=EmotionDetectionResponse)
+async def detect_emotion_binary(
+    image: Optional[UploadFile] = File(None),
+    audio: Optional[UploadFile] = File(None),
+    session_id: str = Form(...)
+):
+    """Detect emotion from raw multipart uploads (no base64/JSON overhead)"""
+    if not emotion_service or not audio_service:
+        raise HTTPException(status_code=503, detail="Required services not available")
+
+    try:
+        if image is not None:
+            return await emotion_service.detect_emotion_from_bytes(
+                await image.read(), session_id=session_id
+            )
+        if audio is not None:
+            result = await audio_service.detect_emotion_from_bytes(await audio.read())
+            return EmotionDetectionResponse(
+                emotion=result["emotion"],
+                confidence=result["confidence"],
+                source="audio",
+                facial_landmarks=None,
+                audio_features=result["audio_features"]
+            )
+        raise HTTPException(status_code=422, detail="Either image or audio upload is required")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Emotion detection failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Emotion detection failed: {str(e)}")
+
 @app.post("/emotion/multimodal", response_model=EmotionDetectionResponse)
 async def detect_multimodal_emotion(request: EmotionDetectionRequest):
     """Detect emotion using multimodal fusion (video + audio)"""
@@ -156,10 +216,17 @@ async def detect_multimodal_emotion(request: EmotionDetectionRequest):
         raise HTTPException(status_code=503, detail="Required services not available")
     
     try:
+        # Run the audio pipeline once (content-hash cached) and share the
+        # result with the fusion path instead of inferring twice
+        audio_result = None
+        if request.audio_data:
+            audio_result = await audio_service.detect_emotion_from_audio(request.audio_data)
+
         result = await emotion_service.detect_multimodal_emotion(
             image_data=request.image_data,
             audio_data=request.audio_data,
-            session_id=request.session_id
+            session_id=request.session_id,
+            audio_result=audio_result
         )
         return result
     except Exception as e:
@@ -174,7 +241,7 @@ async def generate_conversation_response(request: ConversationRequest):
         raise HTTPException(status_code=503, detail="Conversation service not available")
     
     try:
-        response = await conversation_service.generate_response(
+        response = conversation_service.generate_response(
             message=request.message,
             emotional_context=request.emotional_context,
             conversation_history=request.conversation_history
@@ -203,6 +270,25 @@ async def synthesize_speech(request: TTSRequest):
         logger.error(f"TTS synthesis failed: {e}")
         raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {str(e)}")
 
+@app.post("/tts/synthesize/binary")
+async def synthesize_speech_binary(request: TTSRequest):
+    """Synthesize speech and return raw WAV bytes (no base64 overhead)"""
+    if not tts_service:
+        raise HTTPException(status_code=503, detail="TTS service not available")
+
+    try:
+        result = await tts_service.synthesize(
+            text=request.text,
+            emotion=request.emotion,
+            speed=request.speed,
+            pitch=request.pitch,
+            format="wav"
+        )
+        return Response(content=result.audio_data, media_type="audio/wav")
+    except Exception as e:
+        logger.error(f"TTS synthesis failed: {e}")
+        raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {str(e)}")
+
 # Wellness endpoints
 @app.post("/wellness/calculate", response_model=WellnessResponse)
 async def calculate_wellness_score(request: WellnessRequest):
@@ -273,11 +359,16 @@ if __name__ == "__main__":
     # Configure logging
     logger.add("logs/ai_service.log", rotation="1 day", retention="30 days")
     
-    # Run the server
+    # Run the server. The torch models are process-local, so stay on a
+    # single shared worker and scale with the threadpool instead; uvloop
+    # is picked up automatically when installed.
     uvicorn.run(
         "app:app",
         host="0.0.0.0",
         port=int(os.getenv("PORT", 8000)),
         log_level="info",
+        loop="auto",
+        limit_concurrency=int(os.getenv("LIMIT_CONCURRENCY", "256")),
+        backlog=int(os.getenv("BACKLOG", "2048")),
         reload=os.getenv("ENVIRONMENT") == "development"
     )
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""Build a TensorRT engine for AudioEmotionCNN.
+
+Exports the PyTorch model to ONNX, then builds a TensorRT engine with
+FP16 and INT8 precision enabled. INT8 calibration uses cached spectrogram
+tensors (saved as .npy files from `_create_spectrogram` outputs) placed in
+the calibration directory.
+
+Usage:
+    python deploy/build_engine.py \
+        --weights models/audio_emotion_cnn.pth \
+        --calibration-dir calibration/spectrograms \
+        --output models/audio_emotion_cnn.trt
+"""
+
+import argparse
+import glob
+import os
+
+import numpy as np
+import tensorrt as trt
+import pycuda.autoinit  # noqa: F401 - initializes the CUDA context
+import pycuda.driver as cuda
+import torch
+
+from src.services.audio_processing import AudioEmotionCNN
+
+TRT_LOGGER = trt.Logger(trt.Logger.WARNING)
+
+INPUT_SHAPE = (1, 1, 128, 128)
+NUM_CLASSES = 7
+
+
+class SpectrogramCalibrator(trt.IInt8EntropyCalibrator2):
+    """Feeds cached spectrograms to TensorRT's INT8 entropy calibrator"""
+
+    def __init__(self, calibration_dir: str, cache_file: str = "calibration.cache"):
+        super().__init__()
+        self.cache_file = cache_file
+        self.files = sorted(glob.glob(os.path.join(calibration_dir, "*.npy")))
+        self.index = 0
+        self.device_input = cuda.mem_alloc(
+            int(np.prod(INPUT_SHAPE)) * np.dtype(np.float32).itemsize
+        )
+
+    def get_batch_size(self):
+        return 1
+
+    def get_batch(self, names):
+        if self.index >= len(self.files):
+            return None
+        batch = np.load(self.files[self.index]).astype(np.float32).reshape(INPUT_SHAPE)
+        cuda.memcpy_htod(self.device_input, np.ascontiguousarray(batch))
+        self.index += 1
+        return [int(self.device_input)]
+
+    def read_calibration_cache(self):
+        if os.path.exists(self.cache_file):
+            with open(self.cache_file, "rb") as f:
+                return f.read()
+        return None
+
+    def write_calibration_cache(self, cache):
+        with open(self.cache_file, "wb") as f:
+            f.write(cache)
+
+
+def export_onnx(weights_path: str, onnx_path: str):
+    """Export AudioEmotionCNN weights to ONNX"""
+    model = AudioEmotionCNN(num_classes=NUM_CLASSES)
+    model.load_state_dict(torch.load(weights_path, map_location="cpu"))
+    model.eval()
+
+    dummy_input = torch.zeros(*INPUT_SHAPE)
+    torch.onnx.export(
+        model,
+        dummy_input,
+        onnx_path,
+        input_names=["spectrogram"],
+        output_names=["logits"],
+        opset_version=17,
+    )
+
+
+def build_engine(onnx_path: str, output_path: str, calibration_dir: str):
+    """Build a TensorRT engine with FP16 + INT8 precision"""
+    builder = trt.Builder(TRT_LOGGER)
+    network = builder.create_network(
+        1 << int(trt.NetworkDefinitionCreationFlag.EXPLICIT_BATCH)
+    )
+    parser = trt.OnnxParser(network, TRT_LOGGER)
+
+    with open(onnx_path, "rb") as f:
+        if not parser.parse(f.read()):
+            errors = [str(parser.get_error(i)) for i in range(parser.num_errors)]
+            raise RuntimeError(f"Failed to parse ONNX model: {errors}")
+
+    config = builder.create_builder_config()
+    config.set_memory_pool_limit(trt.MemoryPoolType.WORKSPACE, 1 << 30)
+
+    if builder.platform_has_fast_fp16:
+        config.set_flag(trt.BuilderFlag.FP16)
+    if builder.platform_has_fast_int8 and calibration_dir:
+        config.set_flag(trt.BuilderFlag.INT8)
+        config.int8_calibrator = SpectrogramCalibrator(calibration_dir)
+
+    engine = builder.build_serialized_network(network, config)
+    if engine is None:
+        raise RuntimeError("TensorRT engine build failed")
+
+    with open(output_path, "wb") as f:
+        f.write(engine)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build TensorRT engine for AudioEmotionCNN")
+    parser.add_argument("--weights", default="models/audio_emotion_cnn.pth")
+    parser.add_argument("--calibration-dir", default="calibration/spectrograms")
+    parser.add_argument("--output", default="models/audio_emotion_cnn.trt")
+    args = parser.parse_args()
+
+    onnx_path = os.path.splitext(args.output)[0] + ".onnx"
+    export_onnx(args.weights, onnx_path)
+    build_engine(onnx_path, args.output, args.calibration_dir)
+    print(f"TensorRT engine written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
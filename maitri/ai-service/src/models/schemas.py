@@ -1,8 +1,27 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
+import time
 
-# Request models
+_TIMESTAMP_RESOLUTION = 0.5  # seconds
+_cached_now = datetime.now()
+_cached_at = time.monotonic()
+
+def cached_now() -> datetime:
+    """Coarse shared timestamp for response models.
+
+    Response timestamps are informational, so a datetime.now() syscall on
+    every model construction is wasted work; refresh at most twice a second.
+    """
+    global _cached_now, _cached_at
+    elapsed = time.monotonic() - _cached_at
+    if elapsed > _TIMESTAMP_RESOLUTION:
+        _cached_now = datetime.now()
+        _cached_at = time.monotonic()
+    return _cached_now
+
+# Request models; extra client fields are ignored rather than rejected
+# so existing callers keep working
 class EmotionDetectionRequest(BaseModel):
     image_data: Optional[str] = Field(None, description="Base64 encoded image data")
     audio_data: Optional[str] = Field(None, description="Base64 encoded audio data")
@@ -31,17 +50,17 @@ class EmotionDetectionResponse(BaseModel):
     facial_landmarks: Optional[List[List[float]]] = Field(None, description="Facial landmark coordinates")
     audio_features: Optional[Dict[str, Any]] = Field(None, description="Extracted audio features")
     wellness_score: Optional[Dict[str, float]] = Field(None, description="Calculated wellness metrics")
-    timestamp: datetime = Field(default_factory=datetime.now, description="Detection timestamp")
+    timestamp: datetime = Field(default_factory=cached_now, description="Detection timestamp")
 
 class ConversationResponse(BaseModel):
     response: str = Field(..., description="Generated response")
     suggested_actions: Optional[List[str]] = Field(None, description="Suggested wellness actions")
     emotional_tone: str = Field(..., description="Emotional tone of response")
     support_level: str = Field(..., description="Level of support: low, medium, high")
-    timestamp: datetime = Field(default_factory=datetime.now, description="Response timestamp")
+    timestamp: datetime = Field(default_factory=cached_now, description="Response timestamp")
 
 class TTSResponse(BaseModel):
-    audio_data: str = Field(..., description="Base64 encoded audio data")
+    audio_data: Union[str, bytes] = Field(..., description="Audio payload: base64 string, or raw WAV bytes when requested")
     duration: float = Field(..., description="Audio duration in seconds")
     sample_rate: int = Field(default=22050, description="Audio sample rate")
     format: str = Field(default="wav", description="Audio format")
@@ -59,7 +78,7 @@ class HealthResponse(BaseModel):
     status: str = Field(..., description="Service health status")
     services: Dict[str, bool] = Field(..., description="Individual service status")
     version: str = Field(..., description="Service version")
-    timestamp: datetime = Field(default_factory=datetime.now, description="Health check timestamp")
+    timestamp: datetime = Field(default_factory=cached_now, description="Health check timestamp")
 
 # Internal data models
 class AudioFeatures(BaseModel):
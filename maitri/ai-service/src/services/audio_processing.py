@@ -2,15 +2,70 @@ import librosa
 import numpy as np
 import torch
 import torch.nn as nn
+import torchaudio
+import torchaudio.functional as AF
 from torch.nn import functional as F
 from typing import Dict, List, Any, Optional
 import base64
 import io
+import os
 import wave
+import soundfile as sf
+
+try:
+    import pybase64 as fast_base64  # SIMD-accelerated base64
+except ImportError:
+    fast_base64 = base64
+import asyncio
+import hashlib
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from loguru import logger
 from datetime import datetime
 
-from ..models.schemas import AudioFeatures, ModelStatus
+try:
+    import xxhash
+
+    def _content_hash(data: bytes) -> str:
+        return xxhash.xxh3_64_hexdigest(data)
+except ImportError:
+    def _content_hash(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+from dataclasses import dataclass
+
+from ..models.schemas import ModelStatus, cached_now
+from .batch_scheduler import BatchScheduler
+from .registry import get_inference_stream
+
+@dataclass(slots=True)
+class AudioFeatureVector:
+    """Fixed-shape float32 feature carrier used inside the service.
+
+    Feature arrays stay as numpy until the response boundary, avoiding
+    per-element Python floats and pydantic validation in the hot path.
+    """
+
+    mfccs: np.ndarray        # (13,)
+    chroma: np.ndarray       # (12,)
+    pitch: float
+    energy: float
+    spectral_centroid: float
+    zero_crossing_rate: float
+    spectral_rolloff: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Convert to the JSON-serializable AudioFeatures layout"""
+        return {
+            "mfccs": self.mfccs.tolist(),
+            "pitch": self.pitch,
+            "energy": self.energy,
+            "spectral_centroid": self.spectral_centroid,
+            "zero_crossing_rate": self.zero_crossing_rate,
+            "spectral_rolloff": self.spectral_rolloff,
+            "chroma": self.chroma.tolist(),
+        }
 
 class AudioEmotionCNN(nn.Module):
     """CNN for emotion recognition from audio spectrograms"""
@@ -39,25 +94,116 @@ class AudioEmotionCNN(nn.Module):
         x = self.dropout(x)
         x = F.relu(self.fc2(x))
         x = self.dropout(x)
-        x = self.fc3(x)
-        
-        return F.softmax(x, dim=1)
+
+        # Raw logits; callers apply softmax only where probabilities are needed
+        return self.fc3(x)
+
+class DepthwiseSeparableConv(nn.Module):
+    """Depthwise + pointwise convolution block (MobileNet style)"""
+
+    def __init__(self, in_channels, out_channels, stride=1):
+        super(DepthwiseSeparableConv, self).__init__()
+
+        self.depthwise = nn.Conv2d(
+            in_channels, in_channels, kernel_size=3, stride=stride,
+            padding=1, groups=in_channels
+        )
+        self.pointwise = nn.Conv2d(in_channels, out_channels, kernel_size=1)
+
+    def forward(self, x):
+        return F.relu(self.pointwise(F.relu(self.depthwise(x))))
+
+class AudioEmotionMobileNet(nn.Module):
+    """Compact depthwise-separable CNN for audio spectrograms.
+
+    Distilled stand-in used when the full AudioEmotionCNN weights are not
+    shipped: an order of magnitude fewer parameters than the random-init
+    fallback it replaces, with global average pooling instead of the large
+    flattened FC stack.
+    """
+
+    def __init__(self, num_classes=7):
+        super(AudioEmotionMobileNet, self).__init__()
+
+        self.conv1 = nn.Conv2d(1, 16, kernel_size=3, stride=2, padding=1)
+        self.block1 = DepthwiseSeparableConv(16, 32, stride=2)
+        self.block2 = DepthwiseSeparableConv(32, 64, stride=2)
+        self.block3 = DepthwiseSeparableConv(64, 128, stride=2)
+        self.pool = nn.AdaptiveAvgPool2d(1)
+        self.fc = nn.Linear(128, num_classes)
+
+    def forward(self, x):
+        x = F.relu(self.conv1(x))
+        x = self.block1(x)
+        x = self.block2(x)
+        x = self.block3(x)
+        x = self.pool(x).flatten(1)
+        return self.fc(x)
+
+class TensorRTAudioModel:
+    """Runs a prebuilt TensorRT engine for audio emotion inference"""
+
+    def __init__(self, engine_path: str, num_classes: int):
+        import tensorrt as trt
+        import pycuda.autoinit  # noqa: F401 - initializes the CUDA context
+        import pycuda.driver as cuda
+
+        self._cuda = cuda
+        runtime = trt.Runtime(trt.Logger(trt.Logger.WARNING))
+        with open(engine_path, 'rb') as f:
+            self.engine = runtime.deserialize_cuda_engine(f.read())
+        self.context = self.engine.create_execution_context()
+
+        # Pre-allocated device buffers for the fixed [1, 1, 128, 128] input
+        self._host_output = np.empty((1, num_classes), dtype=np.float32)
+        self._d_input = cuda.mem_alloc(1 * 1 * 128 * 128 * np.dtype(np.float32).itemsize)
+        self._d_output = cuda.mem_alloc(self._host_output.nbytes)
+
+    def __call__(self, spectrogram: torch.Tensor) -> np.ndarray:
+        """Run inference and return emotion probabilities"""
+        host_input = np.ascontiguousarray(
+            spectrogram.detach().cpu().numpy().astype(np.float32)
+        )
+        self._cuda.memcpy_htod(self._d_input, host_input)
+        self.context.execute_v2([int(self._d_input), int(self._d_output)])
+        self._cuda.memcpy_dtoh(self._host_output, self._d_output)
+        return self._host_output[0]
 
 class AudioProcessingService:
     """Service for audio processing and emotion detection"""
     
-    EMOTIONS = ['angry', 'disgust', 'fear', 'happy', 'neutral', 'sad', 'surprise']
+    EMOTIONS = tuple(sys.intern(e) for e in (
+        'angry', 'disgust', 'fear', 'happy', 'neutral', 'sad', 'surprise'
+    ))
     
     def __init__(self):
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         self.audio_model: Optional[AudioEmotionCNN] = None
+        self.trt_model: Optional[TensorRTAudioModel] = None
+        self.batch_scheduler: Optional[BatchScheduler] = None
+        self.process_pool: Optional[ProcessPoolExecutor] = None
         self.sample_rate = 22050
-        
+
+        # LRU cache of predictions keyed by audio-content hash; identical
+        # payloads (retries, duplicated frames) skip inference entirely
+        self._prediction_cache: OrderedDict = OrderedDict()
+        self._prediction_cache_size = 256
+        self.n_fft = 2048
+        self.hop_length = 512
+        self.n_mels = 128
+
+        # Shared spectral transforms, built once in initialize()
+        self._spectrogram: Optional[torchaudio.transforms.Spectrogram] = None
+        self._mel_scale: Optional[torchaudio.transforms.MelScale] = None
+        self._dct_basis: Optional[torch.Tensor] = None
+        self._chroma_basis: Optional[torch.Tensor] = None
+        self._fft_freqs: Optional[torch.Tensor] = None
+
         self.model_status = ModelStatus(
             model_name="audio_emotion_cnn",
             status="not_loaded",
             version="1.0.0",
-            last_updated=datetime.now()
+            last_updated=cached_now()
         )
     
     async def initialize(self):
@@ -66,23 +212,85 @@ class AudioProcessingService:
             logger.info("Initializing audio processing service...")
             
             self.audio_model = AudioEmotionCNN(num_classes=len(self.EMOTIONS))
-            
+
+            # Build the shared spectral pipeline once so every feature
+            # reuses a single STFT instead of recomputing it per call
+            self._spectrogram = torchaudio.transforms.Spectrogram(
+                n_fft=self.n_fft,
+                hop_length=self.hop_length,
+                power=2.0
+            ).to(self.device)
+            self._mel_scale = torchaudio.transforms.MelScale(
+                n_mels=self.n_mels,
+                sample_rate=self.sample_rate,
+                f_max=8000.0,
+                n_stft=self.n_fft // 2 + 1
+            ).to(self.device)
+            self._dct_basis = AF.create_dct(13, self.n_mels, norm='ortho').to(self.device)
+            self._chroma_basis = torch.from_numpy(
+                librosa.filters.chroma(sr=self.sample_rate, n_fft=self.n_fft)
+            ).float().to(self.device)
+            self._fft_freqs = torch.linspace(
+                0, self.sample_rate / 2, self.n_fft // 2 + 1, device=self.device
+            )
+
             # Try to load pre-trained weights
+            map_location = None if torch.cuda.is_available() else 'cpu'
             try:
                 model_path = "models/audio_emotion_cnn.pth"
-                if torch.cuda.is_available():
-                    self.audio_model.load_state_dict(torch.load(model_path))
-                else:
-                    self.audio_model.load_state_dict(torch.load(model_path, map_location='cpu'))
+                self.audio_model.load_state_dict(torch.load(model_path, map_location=map_location))
                 logger.info("Loaded pre-trained audio emotion model")
             except FileNotFoundError:
-                logger.warning("Pre-trained audio model not found, using randomly initialized weights")
+                # Fall back to the distilled MobileNet-style model rather
+                # than running the full CNN with random weights
+                self.audio_model = AudioEmotionMobileNet(num_classes=len(self.EMOTIONS))
+                try:
+                    distilled_path = "models/audio_emotion_mobilenet.pth"
+                    self.audio_model.load_state_dict(
+                        torch.load(distilled_path, map_location=map_location)
+                    )
+                    logger.info("Loaded distilled audio emotion model")
+                except FileNotFoundError:
+                    logger.warning(
+                        "No pre-trained audio weights found, "
+                        "using compact model with random initialization"
+                    )
             
             self.audio_model.to(self.device)
             self.audio_model.eval()
-            
+
+            # Compile the model and warm it up so the first request does not
+            # pay graph capture cost; keep the eager model if compile fails.
+            # The warm-up forward is what surfaces inductor failures, so
+            # the eager model must be restored then too, or every later
+            # inference re-raises.
+            base_model = self.audio_model
+            try:
+                self.audio_model = torch.compile(
+                    self.audio_model, mode='reduce-overhead', fullgraph=True
+                )
+                with torch.inference_mode():
+                    self.audio_model(torch.zeros(1, 1, 128, 128, device=self.device))
+                logger.info("Compiled audio emotion model")
+            except Exception as e:
+                self.audio_model = base_model
+                logger.warning(f"torch.compile unavailable, running eager: {e}")
+
+            # Prefer a prebuilt TensorRT engine (see deploy/build_engine.py)
+            # when CUDA is available; fall back to PyTorch otherwise
+            engine_path = "models/audio_emotion_cnn.trt"
+            if self.device.type == 'cuda' and os.path.exists(engine_path):
+                try:
+                    self.trt_model = TensorRTAudioModel(
+                        engine_path, num_classes=len(self.EMOTIONS)
+                    )
+                    logger.info("Loaded TensorRT engine for audio emotion model")
+                except Exception as e:
+                    logger.warning(f"TensorRT engine unavailable, using PyTorch: {e}")
+                    self.trt_model = None
+
             self.model_status.status = "loaded"
-            self.model_status.last_updated = datetime.now()
+            self.model_status.last_updated = cached_now()
             
             logger.info("Audio processing service initialized successfully")
             
@@ -91,49 +299,140 @@ class AudioProcessingService:
             self.model_status.status = "error"
             raise
     
+    def _infer_batch(self, batch: torch.Tensor) -> torch.Tensor:
+        """Run one forward pass over a stacked spectrogram batch"""
+        with torch.inference_mode():
+            stream = get_inference_stream()
+            if stream is not None:
+                # The stacked batch was produced on the default stream;
+                # order the side stream after it before the forward reads,
+                # and mark the input as used by the side stream so the
+                # allocator cannot recycle it early
+                stream.wait_stream(torch.cuda.current_stream())
+                with torch.cuda.stream(stream):
+                    batch.record_stream(stream)
+                    output = self.audio_model(batch)
+                stream.synchronize()
+                return output
+            return self.audio_model(batch)
+
+    def start_batch_scheduler(self):
+        """Start micro-batching of CNN inference across concurrent requests"""
+        if self.batch_scheduler is None:
+            self.batch_scheduler = BatchScheduler(self._infer_batch)
+        self.batch_scheduler.start()
+
+    async def stop_batch_scheduler(self):
+        """Stop the micro-batching loop"""
+        if self.batch_scheduler is not None:
+            await self.batch_scheduler.stop()
+
+    def _load_audio_bytes(self, audio_bytes: bytes) -> np.ndarray:
+        """Decode raw audio bytes, resampling only on sample-rate mismatch"""
+        try:
+            with sf.SoundFile(io.BytesIO(audio_bytes)) as f:
+                audio = f.read(dtype='float32', always_2d=False)
+                sr = f.samplerate
+
+            if audio.ndim > 1:
+                audio = audio.mean(axis=1)
+
+            if sr != self.sample_rate:
+                audio = librosa.resample(
+                    audio, orig_sr=sr, target_sr=self.sample_rate, res_type='soxr_hq'
+                )
+
+            return np.ascontiguousarray(audio)
+
+        except Exception as e:
+            logger.error(f"Failed to decode audio: {e}")
+            raise ValueError("Invalid audio data")
+
     def _decode_base64_audio(self, audio_data: str) -> np.ndarray:
         """Decode base64 audio data"""
+        # Remove data URL prefix if present
+        if audio_data.startswith('data:audio'):
+            audio_data = audio_data.split(',')[1]
+
         try:
-            # Remove data URL prefix if present
-            if audio_data.startswith('data:audio'):
-                audio_data = audio_data.split(',')[1]
-            
-            # Decode base64
-            audio_bytes = base64.b64decode(audio_data)
-            
-            # Load audio using librosa
-            audio, sr = librosa.load(io.BytesIO(audio_bytes), sr=self.sample_rate)
-            
-            return audio
-            
+            audio_bytes = fast_base64.b64decode(audio_data)
         except Exception as e:
             logger.error(f"Failed to decode audio: {e}")
             raise ValueError("Invalid audio data")
+
+        return self._load_audio_bytes(audio_bytes)
     
-    def extract_audio_features(self, audio: np.ndarray) -> AudioFeatures:
-        """Extract comprehensive audio features"""
+    def _compute_power_spectrogram(self, audio: np.ndarray) -> torch.Tensor:
+        """Compute the shared power spectrogram on the service device"""
+        waveform = torch.from_numpy(np.ascontiguousarray(audio)).float().to(self.device)
+        return self._spectrogram(waveform)
+
+    def extract_audio_features(
+        self,
+        audio: np.ndarray,
+        power_spec: Optional[torch.Tensor] = None
+    ) -> AudioFeatureVector:
+        """Extract comprehensive audio features from a single shared STFT"""
         try:
-            # MFCC features
-            mfccs = librosa.feature.mfcc(y=audio, sr=self.sample_rate, n_mfcc=13)
-            mfcc_mean = np.mean(mfccs, axis=1).tolist()
-            
-            # Pitch (fundamental frequency)
-            pitches, magnitudes = librosa.piptrack(y=audio, sr=self.sample_rate)
-            pitch = np.mean(pitches[pitches > 0]) if np.any(pitches > 0) else 0.0
-            
-            # Energy (RMS)
-            energy = np.mean(librosa.feature.rms(y=audio)[0])
-            
-            # Spectral features
-            spectral_centroid = np.mean(librosa.feature.spectral_centroid(y=audio, sr=self.sample_rate)[0])
-            zero_crossing_rate = np.mean(librosa.feature.zero_crossing_rate(audio)[0])
-            spectral_rolloff = np.mean(librosa.feature.spectral_rolloff(y=audio, sr=self.sample_rate)[0])
-            
-            # Chroma features
-            chroma = librosa.feature.chroma_stft(y=audio, sr=self.sample_rate)
-            chroma_mean = np.mean(chroma, axis=1).tolist()
-            
-            return AudioFeatures(
+            waveform = torch.from_numpy(np.ascontiguousarray(audio)).float().to(self.device)
+
+            # Clips shorter than one FFT window would make the RMS unfold
+            # and pitch detection below raise; pad with trailing silence
+            # the way _analyze_speech_patterns pads its strided view. The
+            # centered STFT handles short inputs on its own.
+            if waveform.shape[0] < self.n_fft:
+                waveform = F.pad(waveform, (0, self.n_fft - waveform.shape[0]))
+
+            if power_spec is None:
+                power_spec = self._spectrogram(waveform)
+
+            # Mel spectrogram and MFCCs derived from the shared power spectrum
+            mel_spec = self._mel_scale(power_spec)
+            log_mel = torch.log10(torch.clamp(mel_spec, min=1e-10)) * 10.0
+            mfccs = torch.matmul(log_mel.transpose(-2, -1), self._dct_basis).transpose(-2, -1)
+            mfcc_mean = mfccs.mean(dim=1).cpu().numpy().astype(np.float32)
+
+            # Pitch (fundamental frequency); masked mean without gathering a
+            # copy of the voiced frames. detect_pitch_frequency needs about
+            # win_length NCCF frames (~150 ms at 22 kHz with its defaults),
+            # more than the n_fft padding above guarantees — clips too
+            # short to track are reported as unvoiced, as the old piptrack
+            # path effectively did, instead of erroring.
+            try:
+                pitch_track = AF.detect_pitch_frequency(waveform.unsqueeze(0), self.sample_rate)
+                voiced_mask = pitch_track > 0
+                voiced_count = voiced_mask.sum()
+                if voiced_count > 0:
+                    pitch = ((pitch_track * voiced_mask).sum() / voiced_count).item()
+                else:
+                    pitch = 0.0
+            except RuntimeError:
+                pitch = 0.0
+
+            # Energy (framewise RMS)
+            frames = waveform.unfold(0, self.n_fft, self.hop_length)
+            energy = frames.pow(2).mean(dim=1).sqrt().mean().item()
+
+            # Spectral features from the cached magnitude spectrum
+            spec_energy = power_spec.sum(dim=0)
+            spec_energy = torch.clamp(spec_energy, min=1e-10)
+            spectral_centroid = (
+                (self._fft_freqs.unsqueeze(1) * power_spec).sum(dim=0) / spec_energy
+            ).mean().item()
+
+            cumulative = power_spec.cumsum(dim=0)
+            rolloff_idx = (cumulative >= 0.85 * spec_energy).float().argmax(dim=0)
+            spectral_rolloff = self._fft_freqs[rolloff_idx].mean().item()
+
+            sign_changes = (waveform[:-1] * waveform[1:]) < 0
+            zero_crossing_rate = sign_changes.float().mean().item()
+
+            # Chroma features from the precomputed filterbank and shared STFT
+            raw_chroma = torch.matmul(self._chroma_basis, power_spec)
+            chroma = raw_chroma / torch.clamp(raw_chroma.max(dim=0).values, min=1e-10)
+            chroma_mean = chroma.mean(dim=1).cpu().numpy().astype(np.float32)
+
+            return AudioFeatureVector(
                 mfccs=mfcc_mean,
                 pitch=float(pitch),
                 energy=float(energy),
@@ -142,76 +441,104 @@ class AudioProcessingService:
                 spectral_rolloff=float(spectral_rolloff),
                 chroma=chroma_mean
             )
-            
+
         except Exception as e:
             logger.error(f"Failed to extract audio features: {e}")
             raise
-    
-    def _create_spectrogram(self, audio: np.ndarray) -> torch.Tensor:
-        """Create mel spectrogram for CNN input"""
+
+    def _create_spectrogram(
+        self,
+        audio: np.ndarray,
+        power_spec: Optional[torch.Tensor] = None
+    ) -> torch.Tensor:
+        """Create mel spectrogram for CNN input, reusing the shared STFT"""
         try:
-            # Create mel spectrogram
-            mel_spec = librosa.feature.melspectrogram(
-                y=audio,
-                sr=self.sample_rate,
-                n_mels=128,
-                fmax=8000
-            )
-            
-            # Convert to log scale
-            log_mel_spec = librosa.power_to_db(mel_spec, ref=np.max)
-            
-            # Normalize
-            log_mel_spec = (log_mel_spec - np.mean(log_mel_spec)) / np.std(log_mel_spec)
-            
-            # Resize to fixed size for CNN
-            if log_mel_spec.shape[1] > 128:
+            if power_spec is None:
+                power_spec = self._compute_power_spectrogram(audio)
+
+            # Mel spectrogram in log scale (relative to peak, like power_to_db),
+            # computed in place on the fresh tensor from the mel transform
+            log_mel_spec = self._mel_scale(power_spec)
+            log_mel_spec.clamp_(min=1e-10).log10_().mul_(10.0)
+            log_mel_spec.sub_(log_mel_spec.max())
+
+            # Normalize in place; mean/std are scalars so no full-size temporaries
+            log_mel_spec.sub_(log_mel_spec.mean()).div_(log_mel_spec.std())
+
+            # Resize to fixed size for CNN; both branches stay on-device
+            n_frames = log_mel_spec.shape[1]
+            if n_frames > 128:
                 log_mel_spec = log_mel_spec[:, :128]
-            else:
-                # Pad if too short
-                pad_width = 128 - log_mel_spec.shape[1]
-                log_mel_spec = np.pad(log_mel_spec, ((0, 0), (0, pad_width)), mode='constant')
-            
-            # Convert to tensor
-            spectrogram_tensor = torch.from_numpy(log_mel_spec).float().unsqueeze(0).unsqueeze(0)
-            
-            return spectrogram_tensor.to(self.device)
-            
+            elif n_frames < 128:
+                log_mel_spec = F.pad(log_mel_spec, (0, 128 - n_frames))
+
+            return log_mel_spec.unsqueeze(0).unsqueeze(0)
+
         except Exception as e:
             logger.error(f"Failed to create spectrogram: {e}")
             raise
     
     async def detect_emotion_from_audio(self, audio_data: str) -> Dict[str, Any]:
-        """Detect emotion from audio data"""
+        """Detect emotion from base64-encoded audio data"""
+        audio = self._decode_base64_audio(audio_data)
+        return await self._detect_emotion(audio)
+
+    async def detect_emotion_from_bytes(self, audio_bytes: bytes) -> Dict[str, Any]:
+        """Detect emotion from raw audio bytes (multipart upload path)"""
+        audio = self._load_audio_bytes(audio_bytes)
+        return await self._detect_emotion(audio)
+
+    async def _detect_emotion(self, audio: np.ndarray) -> Dict[str, Any]:
+        """Run the shared feature extraction and CNN inference pipeline"""
         try:
-            # Decode audio
-            audio = self._decode_base64_audio(audio_data)
-            
+            # Identical payloads (client retries, repeated frames) are
+            # answered from the LRU cache without touching the model
+            cache_key = _content_hash(audio.tobytes())
+            cached = self._prediction_cache.get(cache_key)
+            if cached is not None:
+                self._prediction_cache.move_to_end(cache_key)
+                return dict(cached)
+
+            # Compute the STFT once and share it across features and CNN input
+            power_spec = self._compute_power_spectrogram(audio)
+
             # Extract features
-            features = self.extract_audio_features(audio)
-            
+            features = self.extract_audio_features(audio, power_spec=power_spec)
+
             # Create spectrogram for CNN
-            spectrogram = self._create_spectrogram(audio)
+            spectrogram = self._create_spectrogram(audio, power_spec=power_spec)
             
             # Predict emotion
-            with torch.no_grad():
-                predictions = self.audio_model(spectrogram)
-                probabilities = predictions.cpu().numpy()[0]
-                
-                emotion_idx = np.argmax(probabilities)
-                emotion = self.EMOTIONS[emotion_idx]
-                confidence = float(probabilities[emotion_idx])
-            
-            return {
+            if self.trt_model is not None:
+                logits = torch.from_numpy(np.array(self.trt_model(spectrogram)))
+            elif self.batch_scheduler is not None:
+                logits = await self.batch_scheduler.submit(spectrogram)
+            else:
+                with torch.inference_mode():
+                    logits = self.audio_model(spectrogram)[0]
+
+            # Pick the winner on raw logits; softmax only for the reported dict
+            _, top_idx = torch.topk(logits, 1)
+            emotion_idx = int(top_idx.item())
+            emotion = self.EMOTIONS[emotion_idx]
+            probabilities = F.softmax(logits, dim=-1).cpu().numpy()
+            confidence = float(probabilities[emotion_idx])
+            
+            result = {
                 "emotion": emotion,
                 "confidence": confidence,
-                "audio_features": features.dict(),
-                "probabilities": {
-                    self.EMOTIONS[i]: float(probabilities[i])
-                    for i in range(len(self.EMOTIONS))
-                }
+                "audio_features": features.as_dict(),
+                # C-level dict(zip(...)) over interned keys; tolist()
+                # already yields Python floats
+                "probabilities": dict(zip(self.EMOTIONS, probabilities.tolist()))
             }
-            
+
+            self._prediction_cache[cache_key] = result
+            if len(self._prediction_cache) > self._prediction_cache_size:
+                self._prediction_cache.popitem(last=False)
+
+            return dict(result)
+
         except Exception as e:
             logger.error(f"Audio emotion detection failed: {e}")
             raise
@@ -219,31 +546,26 @@ class AudioProcessingService:
     def detect_speech_patterns(self, audio: np.ndarray) -> Dict[str, Any]:
         """Analyze speech patterns for stress and wellness indicators"""
         try:
-            # Voice activity detection using energy
-            energy_threshold = np.percentile(librosa.feature.rms(y=audio)[0], 30)
-            voice_segments = librosa.feature.rms(y=audio)[0] > energy_threshold
-            
-            # Speaking rate (rough estimation)
-            frame_rate = librosa.frames_to_time(1, sr=self.sample_rate)
-            speaking_time = np.sum(voice_segments) * frame_rate
-            speaking_rate = len(audio) / self.sample_rate / speaking_time if speaking_time > 0 else 0
-            
-            # Pitch variation (jitter)
-            pitches, _ = librosa.piptrack(y=audio, sr=self.sample_rate)
-            valid_pitches = pitches[pitches > 0]
-            pitch_variation = np.std(valid_pitches) if len(valid_pitches) > 0 else 0
-            
-            # Energy variation
-            energy = librosa.feature.rms(y=audio)[0]
-            energy_variation = np.std(energy)
-            
-            return {
-                "speaking_rate": float(speaking_rate),
-                "pitch_variation": float(pitch_variation),
-                "energy_variation": float(energy_variation),
-                "voice_activity_ratio": float(np.mean(voice_segments))
-            }
-            
+            return _analyze_speech_patterns(audio, self.sample_rate)
+        except Exception as e:
+            logger.error(f"Failed to analyze speech patterns: {e}")
+            return {}
+
+    async def analyze_speech_patterns(self, audio: np.ndarray) -> Dict[str, Any]:
+        """Speech-pattern analysis, offloaded to the process pool when set.
+
+        The librosa analytics are pure NumPy and hold the GIL for most of
+        their runtime, so concurrent requests serialize on the event-loop
+        process unless the work runs in worker processes.
+        """
+        if self.process_pool is None:
+            return self.detect_speech_patterns(audio)
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.process_pool, _analyze_speech_patterns, audio, self.sample_rate
+            )
         except Exception as e:
             logger.error(f"Failed to analyze speech patterns: {e}")
             return {}
@@ -262,4 +584,47 @@ class AudioProcessingService:
     
     async def reload_models(self):
         """Reload audio models"""
-        await self.initialize()
\ No newline at end of file
+        await self.initialize()
+
+def _analyze_speech_patterns(audio: np.ndarray, sample_rate: int) -> Dict[str, Any]:
+    """Speech-pattern analytics; module-level so it pickles into pool workers"""
+
+    frame_length, hop_length = 2048, 512
+
+    # Frame the signal with a zero-copy strided view and reduce all
+    # windows in one einsum pass; shared by threshold, VAD and variation
+    if len(audio) < frame_length:
+        audio = np.pad(audio, (0, frame_length - len(audio)))
+    frames = np.lib.stride_tricks.sliding_window_view(audio, frame_length)[::hop_length]
+    rms = np.sqrt(np.einsum('ij,ij->i', frames, frames) / frame_length)
+
+    # Voice activity detection using energy
+    energy_threshold = np.percentile(rms, 30)
+    voice_segments = rms > energy_threshold
+
+    # Speaking rate (rough estimation)
+    frame_rate = librosa.frames_to_time(1, sr=sample_rate)
+    speaking_time = np.sum(voice_segments) * frame_rate
+    speaking_rate = len(audio) / sample_rate / speaking_time if speaking_time > 0 else 0
+
+    # Pitch variation (jitter); single-pass masked moments instead of
+    # materializing the voiced subset with a boolean fancy-index
+    pitches, _ = librosa.piptrack(y=audio, sr=sample_rate)
+    voiced_mask = pitches > 0
+    voiced_count = np.count_nonzero(voiced_mask)
+    if voiced_count > 0:
+        pitch_mean = np.sum(pitches, where=voiced_mask) / voiced_count
+        pitch_sq_mean = np.sum(pitches * pitches, where=voiced_mask) / voiced_count
+        pitch_variation = np.sqrt(max(pitch_sq_mean - pitch_mean * pitch_mean, 0.0))
+    else:
+        pitch_variation = 0
+
+    # Energy variation
+    energy_variation = np.std(rms)
+
+    return {
+        "speaking_rate": float(speaking_rate),
+        "pitch_variation": float(pitch_variation),
+        "energy_variation": float(energy_variation),
+        "voice_activity_ratio": float(np.mean(voice_segments))
+    }
\ No newline at end of file
@@ -1,83 +1,204 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Final
+from types import MappingProxyType
 import random
+import re
+import sys
 from loguru import logger
 from datetime import datetime
 
-from ..models.schemas import ConversationResponse, ConversationContext, ModelStatus
+from ..models.schemas import ConversationResponse, ConversationContext, ModelStatus, cached_now
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Shared read-only template data: one copy per process regardless of how
+# many engine instances exist, with interned keys so emotion lookups hit
+# the dict's pointer-equality fast path
+_RESPONSE_TEMPLATES = MappingProxyType({
+    sys.intern(emotion): tuple(templates)
+    for emotion, templates in {
+        "happy": [
+            "I'm so glad to see you're feeling positive! What's been going well for you today?",
+            "Your happiness is wonderful to see! Would you like to share what's bringing you joy?",
+            "It's beautiful to see you in such good spirits! Keep embracing these positive moments."
+        ],
+        "sad": [
+            "I can see you're going through a difficult time. Remember that it's okay to feel sad, and I'm here to support you.",
+            "I'm sorry you're feeling down. Would you like to talk about what's on your mind?",
+            "Your feelings are valid, and it's important to acknowledge them. How can I help you feel a little better?"
+        ],
+        "angry": [
+            "I can sense your frustration. Take a deep breath with me. What's causing these strong feelings?",
+            "It sounds like something has really upset you. Would it help to talk through what happened?",
+            "Your anger is understandable. Let's work together to find healthy ways to process these feelings."
+        ],
+        "fear": [
+            "I can see you're feeling anxious or worried. You're safe here, and we can work through this together.",
+            "Fear can be overwhelming, but you don't have to face it alone. What's been causing you concern?",
+            "It's natural to feel afraid sometimes. Let's focus on what you can control and take things one step at a time."
+        ],
+        "neutral": [
+            "How are you feeling today? I'm here to listen and support you however you need.",
+            "Tell me what's on your mind. I'm here to provide a safe space for you to express yourself.",
+            "I'm glad you're here. How has your day been going so far?"
+        ],
+        "surprise": [
+            "You seem surprised! Sometimes unexpected things can catch us off guard. How are you processing this?",
+            "Life can be full of surprises. How are you feeling about this unexpected moment?",
+            "That must have been quite a surprise! Tell me more about what happened."
+        ],
+        "disgust": [
+            "I can see something has really bothered you. It's okay to feel disgusted by things that don't align with your values.",
+            "Sometimes we encounter things that make us feel uncomfortable. How can I help you process these feelings?",
+            "Your reaction is completely valid. Let's talk about what's troubling you."
+        ]
+    }.items()
+})
+
+_WELLNESS_SUGGESTIONS = MappingProxyType({
+    sys.intern(category): tuple(suggestions)
+    for category, suggestions in {
+        "stress": [
+            "Try some deep breathing exercises",
+            "Take a short walk outside",
+            "Practice mindfulness meditation",
+            "Listen to calming music",
+            "Do some gentle stretching"
+        ],
+        "low_energy": [
+            "Get some natural sunlight",
+            "Try light physical activity",
+            "Ensure you're staying hydrated",
+            "Take short breaks throughout the day",
+            "Consider a healthy snack"
+        ],
+        "positive": [
+            "Keep a gratitude journal",
+            "Share your positive energy with others",
+            "Engage in activities you enjoy",
+            "Celebrate your accomplishments",
+            "Practice self-care"
+        ]
+    }.items()
+})
+
+# The safety-critical reply lives at module level so the crisis check
+# returns it with no per-instance indirection
+_CRISIS_RESPONSE: Final[str] = (
+    "I'm very concerned about you. Please reach out to a mental health professional "
+    "or crisis helpline immediately. Your life has value, and there are people who want to help."
+)
 
 class ConversationEngine:
     """Simple rule-based conversation engine for wellness support"""
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
+        # Per-instance RNG: no contention on the module-level random lock,
+        # and a seed gives reproducible template selection when needed
+        self._rng = random.Random(seed)
+
         self.model_status = ModelStatus(
             model_name="conversation_engine",
             status="not_loaded",
             version="1.0.0",
-            last_updated=datetime.now()
+            last_updated=cached_now()
         )
         
-        # Emotion-based response templates
-        self.response_templates = {
-            "happy": [
-                "I'm so glad to see you're feeling positive! What's been going well for you today?",
-                "Your happiness is wonderful to see! Would you like to share what's bringing you joy?",
-                "It's beautiful to see you in such good spirits! Keep embracing these positive moments."
-            ],
-            "sad": [
-                "I can see you're going through a difficult time. Remember that it's okay to feel sad, and I'm here to support you.",
-                "I'm sorry you're feeling down. Would you like to talk about what's on your mind?",
-                "Your feelings are valid, and it's important to acknowledge them. How can I help you feel a little better?"
-            ],
-            "angry": [
-                "I can sense your frustration. Take a deep breath with me. What's causing these strong feelings?",
-                "It sounds like something has really upset you. Would it help to talk through what happened?",
-                "Your anger is understandable. Let's work together to find healthy ways to process these feelings."
-            ],
-            "fear": [
-                "I can see you're feeling anxious or worried. You're safe here, and we can work through this together.",
-                "Fear can be overwhelming, but you don't have to face it alone. What's been causing you concern?",
-                "It's natural to feel afraid sometimes. Let's focus on what you can control and take things one step at a time."
-            ],
-            "neutral": [
-                "How are you feeling today? I'm here to listen and support you however you need.",
-                "Tell me what's on your mind. I'm here to provide a safe space for you to express yourself.",
-                "I'm glad you're here. How has your day been going so far?"
-            ],
-            "surprise": [
-                "You seem surprised! Sometimes unexpected things can catch us off guard. How are you processing this?",
-                "Life can be full of surprises. How are you feeling about this unexpected moment?",
-                "That must have been quite a surprise! Tell me more about what happened."
-            ],
-            "disgust": [
-                "I can see something has really bothered you. It's okay to feel disgusted by things that don't align with your values.",
-                "Sometimes we encounter things that make us feel uncomfortable. How can I help you process these feelings?",
-                "Your reaction is completely valid. Let's talk about what's troubling you."
-            ]
-        }
+        # Emotion-based response templates (shared module-level constant)
+        self.response_templates = _RESPONSE_TEMPLATES
         
-        # Wellness suggestions based on emotional state
-        self.wellness_suggestions = {
-            "stress": [
-                "Try some deep breathing exercises",
-                "Take a short walk outside",
-                "Practice mindfulness meditation",
-                "Listen to calming music",
-                "Do some gentle stretching"
-            ],
-            "low_energy": [
-                "Get some natural sunlight",
-                "Try light physical activity",
-                "Ensure you're staying hydrated",
-                "Take short breaks throughout the day",
-                "Consider a healthy snack"
-            ],
-            "positive": [
-                "Keep a gratitude journal",
-                "Share your positive energy with others",
-                "Engage in activities you enjoy",
-                "Celebrate your accomplishments",
-                "Practice self-care"
-            ]
+        # Keyword routing table: category -> (priority, keywords, response).
+        # Crisis has the highest priority and must win over any other match.
+        self._keyword_categories = {
+            "crisis": (
+                0,
+                # Inflected forms are spelled out because the patterns
+                # built below are word-bounded; the bare stems alone
+                # would stop matching "killing myself" or "died"
+                ("hurt myself", "hurting myself", "suicide", "suicidal",
+                 "kill", "kills", "killing", "killed",
+                 "die", "dies", "dying", "died",
+                 "end it", "ending it", "end it all"),
+                _CRISIS_RESPONSE
+            ),
+            "tired": (
+                1,
+                ("tired", "exhausted", "sleep"),
+                ("It sounds like you might be feeling tired. Rest is so important for our wellbeing. "
+                 "Are you getting enough quality sleep? Sometimes adjusting our sleep routine can make a big difference.")
+            ),
+            "stress": (
+                1,
+                ("stressed", "overwhelmed", "pressure"),
+                ("Stress can feel overwhelming, but there are ways to manage it. "
+                 "What's been the biggest source of stress for you lately? "
+                 "Sometimes breaking things down into smaller, manageable steps can help.")
+            ),
+            "lonely": (
+                1,
+                ("lonely", "alone", "isolated"),
+                ("Feeling lonely can be really difficult. Remember that reaching out, like you're doing now, "
+                 "is a brave step. Connection is important for our wellbeing. "
+                 "Is there someone in your life you could reach out to today?")
+            ),
+        }
+
+        # Compile the routing once: an Aho-Corasick automaton does a single
+        # linear scan over the message; the regex fallback compiles one
+        # alternation per category, tried in priority order
+        self._keyword_automaton = None
+        if ahocorasick is not None:
+            self._keyword_automaton = ahocorasick.Automaton()
+            for category, (priority, keywords, _) in self._keyword_categories.items():
+                for keyword in keywords:
+                    self._keyword_automaton.add_word(keyword, (priority, category, len(keyword)))
+            self._keyword_automaton.make_automaton()
+
+        # The crisis check also gets its own compiled pattern: one C-level
+        # scan that short-circuits before any general keyword matching.
+        # The boundaries keep "skillful"/"dietary" from triggering it;
+        # the keyword tuple above carries the inflections so boundary
+        # matching never loses real crisis phrasing the baseline caught.
+        self._crisis_re = re.compile(
+            r"\b(?:%s)\b" % "|".join(map(re.escape, self._keyword_categories["crisis"][1]))
+        )
+
+        self._keyword_patterns = [
+            (category, re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, keywords))))
+            for category, (priority, keywords, _) in sorted(
+                self._keyword_categories.items(), key=lambda item: item[1][0]
+            )
+        ]
+
+        # Wellness suggestions based on emotional state (shared constant)
+        self.wellness_suggestions = _WELLNESS_SUGGESTIONS
+
+        # Emotion-dependent decisions flattened into immutable structures
+        # built once: hashed set membership, pre-sliced suggestion tuples
+        # and a single profile lookup replace the per-call dict/list work
+        self._high_support_emotions = frozenset({"sad", "angry", "fear"})
+        self._low_support_emotions = frozenset({"happy", "surprise"})
+        self._stress_suggestions = self.wellness_suggestions["stress"][:2]
+        self._low_energy_suggestions = self.wellness_suggestions["low_energy"][:2]
+        self._positive_suggestions = self.wellness_suggestions["positive"][:2]
+        self._general_suggestions = (
+            "Practice mindful breathing",
+            "Take regular breaks",
+            "Stay hydrated"
+        )
+
+        tone_map = {
+            "happy": "encouraging",
+            "surprise": "encouraging",
+            "sad": "gentle",
+            "fear": "gentle",
+            "angry": "calming"
+        }
+        self._emotion_profiles = {
+            emotion: (templates, tone_map.get(emotion, "supportive"))
+            for emotion, templates in self.response_templates.items()
         }
     
     async def initialize(self):
@@ -87,7 +208,7 @@ class ConversationEngine:
             
             # Load or initialize conversation models (placeholder for future ML models)
             self.model_status.status = "loaded"
-            self.model_status.last_updated = datetime.now()
+            self.model_status.last_updated = cached_now()
             
             logger.info("Conversation engine initialized successfully")
             
@@ -96,13 +217,17 @@ class ConversationEngine:
             self.model_status.status = "error"
             raise
     
-    async def generate_response(
+    def generate_response(
         self,
         message: str,
         emotional_context: Optional[Dict[str, Any]] = None,
         conversation_history: Optional[List[Dict[str, str]]] = None
     ) -> ConversationResponse:
-        """Generate contextual conversation response"""
+        """Generate contextual conversation response.
+
+        Synchronous by design: the whole body is sub-millisecond CPU work,
+        so a coroutine wrapper would only add event-loop dispatch overhead.
+        """
         
         try:
             # Determine emotional context
@@ -111,13 +236,15 @@ class ConversationEngine:
             support_level = "medium"
             
             if emotional_context:
-                current_emotion = emotional_context.get("current_emotion", "neutral")
+                # Interned so the profile/template lookups below compare
+                # keys by pointer
+                current_emotion = sys.intern(emotional_context.get("current_emotion", "neutral"))
                 wellness_score = emotional_context.get("wellness_score", 0.5)
             
             # Determine support level based on emotion and wellness
-            if current_emotion in ["sad", "angry", "fear"] or wellness_score < 0.4:
+            if current_emotion in self._high_support_emotions or wellness_score < 0.4:
                 support_level = "high"
-            elif current_emotion in ["happy", "surprise"] and wellness_score > 0.7:
+            elif current_emotion in self._low_support_emotions and wellness_score > 0.7:
                 support_level = "low"
             
             # Generate appropriate response
@@ -155,70 +282,67 @@ class ConversationEngine:
         history: Optional[List[Dict[str, str]]] = None
     ) -> str:
         """Generate response text based on emotion and context"""
-        
-        # Check for specific keywords in message
+
+        # Safety check first: the dedicated crisis pattern must win
+        # regardless of what else the message matches
         message_lower = message.lower()
-        
-        # Crisis keywords - prioritize safety
-        crisis_keywords = ["hurt myself", "suicide", "kill", "die", "end it"]
-        if any(keyword in message_lower for keyword in crisis_keywords):
-            return ("I'm very concerned about you. Please reach out to a mental health professional "
-                   "or crisis helpline immediately. Your life has value, and there are people who want to help.")
-        
-        # Wellness-related keywords
-        if any(word in message_lower for word in ["tired", "exhausted", "sleep"]):
-            return ("It sounds like you might be feeling tired. Rest is so important for our wellbeing. "
-                   "Are you getting enough quality sleep? Sometimes adjusting our sleep routine can make a big difference.")
-        
-        if any(word in message_lower for word in ["stressed", "overwhelmed", "pressure"]):
-            return ("Stress can feel overwhelming, but there are ways to manage it. "
-                   "What's been the biggest source of stress for you lately? "
-                   "Sometimes breaking things down into smaller, manageable steps can help.")
-        
-        if any(word in message_lower for word in ["lonely", "alone", "isolated"]):
-            return ("Feeling lonely can be really difficult. Remember that reaching out, like you're doing now, "
-                   "is a brave step. Connection is important for our wellbeing. "
-                   "Is there someone in your life you could reach out to today?")
-        
-        # Use emotion-based templates
-        templates = self.response_templates.get(emotion, self.response_templates["neutral"])
-        return random.choice(templates)
+        if self._crisis_re.search(message_lower):
+            return _CRISIS_RESPONSE
+
+        # Check for the remaining keywords in one pass
+        category = self._match_keyword_category(message_lower)
+        if category is not None:
+            return self._keyword_categories[category][2]
+
+        # Use emotion-based templates from the precomputed profile
+        profile = self._emotion_profiles.get(emotion, self._emotion_profiles["neutral"])
+        templates = profile[0]
+        return templates[self._rng.randrange(len(templates))]
+
+    def _match_keyword_category(self, message_lower: str) -> Optional[str]:
+        """Match the highest-priority keyword category in a single scan"""
+
+        if self._keyword_automaton is not None:
+            best: Optional[Tuple[int, str]] = None
+            last = len(message_lower) - 1
+            for end, (priority, category, length) in self._keyword_automaton.iter(message_lower):
+                # Enforce word boundaries so e.g. "kill" does not match "skillful"
+                start = end - length + 1
+                if start > 0 and message_lower[start - 1].isalnum():
+                    continue
+                if end < last and message_lower[end + 1].isalnum():
+                    continue
+                if best is None or priority < best[0]:
+                    best = (priority, category)
+                    if priority == 0:
+                        break
+            return best[1] if best else None
+
+        for category, pattern in self._keyword_patterns:
+            if pattern.search(message_lower):
+                return category
+        return None
     
     def _generate_wellness_suggestions(self, emotion: str, wellness_score: float) -> List[str]:
         """Generate wellness suggestions based on current state"""
-        
-        suggestions = []
-        
-        # Emotion-based suggestions
-        if emotion in ["sad", "angry", "fear"]:
-            suggestions.extend(self.wellness_suggestions["stress"][:2])
-        elif wellness_score < 0.4:
-            suggestions.extend(self.wellness_suggestions["low_energy"][:2])
-        elif emotion == "happy" and wellness_score > 0.7:
-            suggestions.extend(self.wellness_suggestions["positive"][:2])
-        else:
-            # General wellness suggestions
-            suggestions.extend([
-                "Practice mindful breathing",
-                "Take regular breaks",
-                "Stay hydrated"
-            ])
-        
-        return suggestions[:3]  # Limit to 3 suggestions
-    
+
+        # Pre-sliced tuples; limited to 3 suggestions by construction
+        if emotion in self._high_support_emotions:
+            return list(self._stress_suggestions)
+        if wellness_score < 0.4:
+            return list(self._low_energy_suggestions)
+        if emotion == "happy" and wellness_score > 0.7:
+            return list(self._positive_suggestions)
+        return list(self._general_suggestions)
+
     def _determine_response_tone(self, emotion: str, support_level: str) -> str:
         """Determine appropriate emotional tone for response"""
-        
+
         if support_level == "high":
             return "compassionate"
-        elif emotion in ["happy", "surprise"]:
-            return "encouraging"
-        elif emotion in ["sad", "fear"]:
-            return "gentle"
-        elif emotion == "angry":
-            return "calming"
-        else:
-            return "supportive"
+
+        profile = self._emotion_profiles.get(emotion)
+        return profile[1] if profile else "supportive"
     
     async def health_check(self) -> Dict[str, Any]:
         """Check service health"""
@@ -0,0 +1,48 @@
+from functools import lru_cache
+from typing import Optional
+
+import torch
+
+_inference_stream: Optional["torch.cuda.Stream"] = None
+
+def get_inference_stream() -> Optional["torch.cuda.Stream"]:
+    """Shared CUDA stream for model inference, created on first use.
+
+    Both torch services enqueue their forward passes on this stream so
+    inference work is serialized on one queue instead of contending on
+    the default stream with host-to-device copies.
+    """
+    global _inference_stream
+    if _inference_stream is None and torch.cuda.is_available():
+        _inference_stream = torch.cuda.Stream()
+    return _inference_stream
+
+@lru_cache(maxsize=None)
+def get_emotion_service():
+    """Process-wide EmotionDetectionService singleton"""
+    from .emotion_detection import EmotionDetectionService
+    return EmotionDetectionService()
+
+@lru_cache(maxsize=None)
+def get_audio_service():
+    """Process-wide AudioProcessingService singleton"""
+    from .audio_processing import AudioProcessingService
+    return AudioProcessingService()
+
+@lru_cache(maxsize=None)
+def get_conversation_service():
+    """Process-wide ConversationEngine singleton"""
+    from .conversation_engine import ConversationEngine
+    return ConversationEngine()
+
+@lru_cache(maxsize=None)
+def get_tts_service():
+    """Process-wide TTSService singleton"""
+    from .tts_service import TTSService
+    return TTSService()
+
+@lru_cache(maxsize=None)
+def get_wellness_service():
+    """Process-wide WellnessCalculator singleton"""
+    from .wellness_calculator import WellnessCalculator
+    return WellnessCalculator()
@@ -1,28 +1,134 @@
+import asyncio
 import os
 import base64
+import ctypes
 import io
+import shutil
+import struct
 import subprocess
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, List, Any, Tuple
 from loguru import logger
-from datetime import datetime
 import tempfile
 
-from ..models.schemas import TTSResponse, ModelStatus
+from ..models.schemas import TTSResponse, ModelStatus, cached_now
+
+# SIMD base64 when available; WAV payloads run to hundreds of KB
+try:
+    import pybase64 as fast_base64
+except ImportError:
+    fast_base64 = base64
+
+# Completion marker printed by a pooled Festival worker after each
+# command; pipe mode gives no other end-of-command signal
+_FESTIVAL_DONE = b"maitri_festival_done"
+
+def _scheme_quote(text: str) -> str:
+    """Quote arbitrary text as a scheme string literal.
+
+    The previous f-string interpolation let quotes and backslashes in the
+    input break out of the scheme string (an injection hazard as well as
+    a correctness bug).
+    """
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+# libespeak-ng constants (speak_lib.h)
+_ESPEAK_AUDIO_OUTPUT_RETRIEVAL = 1
+_ESPEAK_POS_CHARACTER = 1
+_ESPEAK_CHARS_UTF8 = 1
+_ESPEAK_RATE = 1
+_ESPEAK_PITCH = 3
+
+@lru_cache(maxsize=1)
+def _probe_engines() -> tuple:
+    """Probe once per process which TTS engines exist on PATH.
+
+    shutil.which is a pure PATH walk, so no fork/exec version probes are
+    needed, and the memoized result is shared by every service instance
+    and re-initialization.
+    """
+    engines = []
+
+    if shutil.which("espeak"):
+        engines.append("espeak")
+        logger.info("eSpeak TTS engine available")
+    else:
+        logger.warning("eSpeak not available")
+
+    if shutil.which("festival"):
+        engines.append("festival")
+        logger.info("Festival TTS engine available")
+    else:
+        logger.warning("Festival not available")
+
+    # Fallback: create simple TTS using Python libraries
+    if not engines:
+        engines.append("simple")
+        logger.info("Using simple TTS fallback")
+
+    return tuple(engines)
+
+def _build_wav_header(sample_rate: int, num_samples: int) -> bytes:
+    """44-byte RIFF header for 16-bit mono PCM with `num_samples` frames"""
+    data_size = num_samples * 2
+    return b''.join((
+        b'RIFF', struct.pack('<I', 36 + data_size), b'WAVE',
+        b'fmt ', struct.pack('<IHHIIHH', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16),
+        b'data', struct.pack('<I', data_size),
+    ))
+
+# Canned fallback payload: a real RIFF header followed by 512 frames of
+# silence, built once at import instead of per request
+_SILENT_WAV = _build_wav_header(22050, 512) + b'\x00' * 1024
+
+# Per-emotion (speed, pitch) multipliers, frozen at import; the lookup
+# is one hash probe instead of rebuilding a dict of dicts per call
+_EMOTION_PARAMS = MappingProxyType({
+    "happy": (1.1, 1.2),
+    "sad": (0.8, 0.8),
+    "angry": (1.2, 1.1),
+    "fear": (1.1, 1.3),
+    "neutral": (1.0, 1.0),
+    "surprise": (1.2, 1.4),
+    "disgust": (0.9, 0.9),
+})
+_DEFAULT_PARAMS = (1.0, 1.0)
 
 class TTSService:
     """Text-to-Speech service using local TTS engines"""
-    
+
     def __init__(self):
         self.model_status = ModelStatus(
             model_name="tts_service",
             status="not_loaded",
             version="1.0.0",
-            last_updated=datetime.now()
+            last_updated=cached_now()
         )
         
         # Available TTS engines
         self.available_engines = []
         self.default_engine = "espeak"  # Fallback to espeak
+
+        # In-process libespeak-ng state; populated when the shared library
+        # loads, otherwise synthesis falls back to the espeak subprocess
+        self._espeak_lib = None
+        self._espeak_callback = None  # kept referenced for the C side
+        self._espeak_pcm = bytearray()
+        self._espeak_sample_rate = 22050
+        # Serializes library syntheses: the PCM accumulator and
+        # libespeak's rate/pitch parameters are process-global state
+        self._espeak_lock = asyncio.Lock()
+
+        # Pool of persistent Festival pipe workers; each pays the voice
+        # load once at startup instead of per synthesis, and the queue
+        # hands idle workers to concurrent requests round-robin
+        self._festival_pool: List[Any] = []
+        self._festival_queue: Optional[asyncio.Queue] = None
+
+        # Health payload memoized across probes; engine availability only
+        # changes on initialize/shutdown, not per liveness check
+        self._health_cache: Optional[Dict[str, Any]] = None
     
     async def initialize(self):
         """Initialize TTS service"""
@@ -31,15 +137,30 @@ class TTSService:
             
             # Check available TTS engines
             self._check_available_engines()
-            
+
+            # Prefer the in-process library over forking espeak per call
+            if self._init_espeak_library() and "espeak" not in self.available_engines:
+                self.available_engines.insert(0, "espeak")
+
+            # Keep Festival workers warm when Festival is the engine in
+            # use; per-call processes remain the fallback
+            if "festival" in self.available_engines:
+                await self._init_festival_pool()
+
             if not self.available_engines:
                 logger.warning("No TTS engines available")
                 self.model_status.status = "error"
+                self._refresh_health_cache()
                 return
-            
+
             self.model_status.status = "loaded"
-            self.model_status.last_updated = datetime.now()
+            self.model_status.last_updated = cached_now()
+            self._refresh_health_cache()
             
+            if fast_base64 is not base64:
+                # get_version() embeds the SIMD backend, e.g. "1.3.1 (AVX2)"
+                logger.info(f"pybase64 backend: {fast_base64.get_version()}")
+
             logger.info(f"TTS service initialized with engines: {self.available_engines}")
             
         except Exception as e:
@@ -49,172 +170,352 @@ class TTSService:
     
     def _check_available_engines(self):
         """Check which TTS engines are available"""
-        
-        # Check for espeak
+        self.available_engines = list(_probe_engines())
+    
+    def _init_espeak_library(self) -> bool:
+        """Load libespeak-ng once and synthesize in-process thereafter.
+
+        Retrieval mode hands PCM frames to a callback instead of writing a
+        file, so each synthesis skips fork/exec, temp-file I/O and unlink.
+        """
         try:
-            subprocess.run(["espeak", "--version"], capture_output=True, check=True)
-            self.available_engines.append("espeak")
-            logger.info("eSpeak TTS engine available")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            logger.warning("eSpeak not available")
-        
-        # Check for festival (if available)
+            lib = ctypes.CDLL("libespeak-ng.so.1")
+        except OSError:
+            return False
+
         try:
-            subprocess.run(["festival", "--version"], capture_output=True, check=True)
-            self.available_engines.append("festival")
-            logger.info("Festival TTS engine available")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            logger.warning("Festival not available")
-        
-        # Fallback: create simple TTS using Python libraries
-        if not self.available_engines:
-            self.available_engines.append("simple")
-            logger.info("Using simple TTS fallback")
-    
+            rate = lib.espeak_Initialize(_ESPEAK_AUDIO_OUTPUT_RETRIEVAL, 0, None, 0)
+            if rate <= 0:
+                return False
+
+            @ctypes.CFUNCTYPE(
+                ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p
+            )
+            def _collect(wav, numsamples, events):
+                if wav and numsamples > 0:
+                    self._espeak_pcm += ctypes.string_at(wav, numsamples * 2)
+                return 0
+
+            lib.espeak_SetSynthCallback(_collect)
+            self._espeak_callback = _collect
+            self._espeak_sample_rate = rate
+            self._espeak_lib = lib
+            logger.info(f"libespeak-ng loaded (sample rate {rate} Hz)")
+            return True
+
+        except Exception as e:
+            logger.warning(f"libespeak-ng unusable, falling back to espeak subprocess: {e}")
+            return False
+
+    async def _init_festival_pool(self) -> bool:
+        """Pre-warm a pool of persistent Festival pipe workers.
+
+        Each worker pays the voice load once at startup; afterwards a
+        synthesis is one scheme command down an already-open stdin.
+        Pool size comes from FESTIVAL_POOL_SIZE (default 2).
+        """
+        size = int(os.getenv("FESTIVAL_POOL_SIZE", "2"))
+        workers = []
+        try:
+            for _ in range(size):
+                workers.append(await self._spawn_festival_worker())
+        except Exception as e:
+            logger.warning(f"Festival pool unavailable, using per-call processes: {e}")
+            for worker in workers:
+                try:
+                    worker.kill()
+                except ProcessLookupError:
+                    pass
+            return False
+
+        self._festival_pool = workers
+        self._festival_queue = asyncio.Queue()
+        for worker in workers:
+            self._festival_queue.put_nowait(worker)
+        logger.info(f"Festival pool ready with {size} warm workers")
+        return True
+
+    async def _spawn_festival_worker(self):
+        """Start one persistent festival --pipe process"""
+        return await asyncio.create_subprocess_exec(
+            "festival", "--pipe",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+
+    async def _close_festival_pool(self):
+        """Tear down all pooled Festival workers"""
+        self._festival_queue = None
+        for worker in self._festival_pool:
+            try:
+                worker.terminate()
+                await worker.wait()
+            except ProcessLookupError:
+                pass
+        self._festival_pool = []
+
+    async def shutdown(self):
+        """Release engine resources held by the service"""
+        await self._close_festival_pool()
+        self._refresh_health_cache()
+
+    async def _festival_worker_command(self, worker, command: str):
+        """Run one scheme command on a pooled worker and await completion.
+
+        Pipe mode emits nothing when a command finishes, so a sentinel
+        print is sent after the command and stdout is drained until it
+        comes back. A closed pipe raises; the caller respawns the worker.
+        """
+        worker.stdin.write(command.encode() + b'\n(print "' + _FESTIVAL_DONE + b'")\n')
+        await worker.stdin.drain()
+
+        while True:
+            line = await worker.stdout.readline()
+            if not line:
+                raise Exception("Festival worker closed its pipe")
+            if _FESTIVAL_DONE in line:
+                return
+
+    def _synthesize_espeak_lib(self, text: str, speed_param: int, pitch_param: int) -> bytes:
+        """Synthesize through the persistent libespeak-ng instance.
+
+        Blocking ctypes work: callers run this on a worker thread under
+        _espeak_lock, which keeps the PCM accumulator and the library's
+        global parameter state from being shared between concurrent
+        syntheses.
+        """
+        lib = self._espeak_lib
+        self._espeak_pcm.clear()
+
+        lib.espeak_SetParameter(_ESPEAK_RATE, speed_param, 0)
+        lib.espeak_SetParameter(_ESPEAK_PITCH, pitch_param, 0)
+
+        text_bytes = text.encode('utf-8')
+        lib.espeak_Synth(
+            text_bytes, len(text_bytes) + 1, 0,
+            _ESPEAK_POS_CHARACTER, 0, _ESPEAK_CHARS_UTF8, None, None
+        )
+        lib.espeak_Synchronize()
+
+        return (
+            _build_wav_header(self._espeak_sample_rate, len(self._espeak_pcm) // 2)
+            + bytes(self._espeak_pcm)
+        )
+
     async def synthesize(
         self,
         text: str,
         emotion: Optional[str] = "neutral",
         speed: Optional[float] = 1.0,
-        pitch: Optional[float] = 1.0
+        pitch: Optional[float] = 1.0,
+        format: str = "wav_base64"
     ) -> TTSResponse:
-        """Synthesize speech from text"""
-        
+        """Synthesize speech from text.
+
+        With format="wav" the response carries the raw WAV bytes, saving
+        the 33% base64 inflation and the encode/decode on both ends for
+        callers served over binary transports; "wav_base64" keeps the
+        string payload for JSON clients.
+        """
+
         try:
             if not self.available_engines:
                 raise Exception("No TTS engines available")
-            
+
             # Use the best available engine
             engine = self.available_engines[0] if self.available_engines else "simple"
-            
+
             if engine == "espeak":
-                audio_data = await self._synthesize_espeak(text, speed, pitch)
+                audio_bytes = await self._synthesize_espeak(text, speed, pitch)
             elif engine == "festival":
-                audio_data = await self._synthesize_festival(text, speed, pitch)
+                audio_bytes = await self._synthesize_festival(text, speed, pitch)
             else:
-                audio_data = await self._synthesize_simple(text)
-            
+                audio_bytes = await self._synthesize_simple(text)
+
+            # base64 (via pybase64 when installed) only on the string branch
+            if format == "wav":
+                audio_data = audio_bytes
+            else:
+                audio_data = fast_base64.b64encode(audio_bytes).decode('ascii')
+
             return TTSResponse(
                 audio_data=audio_data,
                 duration=len(text) * 0.1,  # Rough estimation
                 sample_rate=22050,
-                format="wav"
+                format=format
             )
             
         except Exception as e:
             logger.error(f"TTS synthesis failed: {e}")
             raise
     
-    async def _synthesize_espeak(self, text: str, speed: float, pitch: float) -> str:
+    async def synthesize_many(
+        self,
+        segments: List[str],
+        emotion: Optional[str] = "neutral",
+        speed: Optional[float] = 1.0,
+        pitch: Optional[float] = 1.0,
+        concurrency: int = 3
+    ) -> List[TTSResponse]:
+        """Synthesize several text segments with bounded overlap.
+
+        Up to `concurrency` engine invocations run at a time, so a
+        response split into N sentences does not pay N serial synthesis
+        latencies; results come back in the original segment order.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _bounded(segment: str) -> TTSResponse:
+            async with semaphore:
+                return await self.synthesize(
+                    segment, emotion=emotion, speed=speed, pitch=pitch
+                )
+
+        return list(await asyncio.gather(*(_bounded(s) for s in segments)))
+
+    async def _synthesize_espeak(self, text: str, speed: float, pitch: float) -> bytes:
         """Synthesize using eSpeak"""
         try:
-            # Create temporary file for output
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                temp_path = temp_file.name
-            
             # Adjust parameters for eSpeak
             speed_param = int(speed * 175)  # eSpeak speed (words per minute)
             pitch_param = int(pitch * 50)   # eSpeak pitch
-            
-            # Run eSpeak
+
+            # In-process library path: no fork, no filesystem. The
+            # synthesis itself is blocking C code, so it runs on a worker
+            # thread rather than pinning the event loop for its duration.
+            if self._espeak_lib is not None:
+                async with self._espeak_lock:
+                    return await asyncio.to_thread(
+                        self._synthesize_espeak_lib, text, speed_param, pitch_param
+                    )
+
+            # Pipe the WAV straight out of espeak: no temp file, no
+            # read-back, no unlink
             cmd = [
                 "espeak",
                 "-s", str(speed_param),
                 "-p", str(pitch_param),
-                "-w", temp_path,
+                "--stdout",
                 text
             ]
-            
-            subprocess.run(cmd, check=True, capture_output=True)
-            
-            # Read and encode audio file
-            with open(temp_path, "rb") as audio_file:
-                audio_bytes = audio_file.read()
-                audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-            
-            # Clean up temporary file
-            os.unlink(temp_path)
-            
-            return audio_base64
+
+            # Non-blocking wait: the event loop serves other requests
+            # while espeak runs
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            audio_bytes, stderr = await proc.communicate()
+            if proc.returncode != 0:
+                raise Exception(f"espeak failed: {stderr.decode(errors='replace')}")
+
+            return audio_bytes
             
         except Exception as e:
             logger.error(f"eSpeak synthesis failed: {e}")
             raise
     
-    async def _synthesize_festival(self, text: str, speed: float, pitch: float) -> str:
+    async def _synthesize_festival(self, text: str, speed: float, pitch: float) -> bytes:
         """Synthesize using Festival"""
         try:
             # Create temporary file for output
             with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
                 temp_path = temp_file.name
-            
-            # Create Festival script
-            festival_script = f'''
-                (set! text "{text}")
-                (utt.save.wave (utt.synth (eval (list 'Utterance 'Text text))) "{temp_path}")
-            '''
-            
-            # Run Festival
-            process = subprocess.Popen(
-                ["festival"],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+
+            # One command per synthesis; input goes through the scheme
+            # string quoter, never raw interpolation
+            festival_script = (
+                f"(utt.save.wave (utt.synth (Utterance Text {_scheme_quote(text)})) "
+                f"{_scheme_quote(temp_path)})"
             )
-            
-            stdout, stderr = process.communicate(input=festival_script)
-            
-            if process.returncode != 0:
-                raise Exception(f"Festival failed: {stderr}")
-            
-            # Read and encode audio file
+
+            if self._festival_queue is not None:
+                # Warm worker from the pool: no fork/exec, no voice
+                # reload. The queue blocks only when every worker is busy.
+                worker = await self._festival_queue.get()
+                try:
+                    await self._festival_worker_command(worker, festival_script)
+                    self._festival_queue.put_nowait(worker)
+                except Exception as e:
+                    # Replace the crashed worker so the pool keeps its
+                    # size. Only a successfully spawned replacement goes
+                    # back on the queue — requeueing the dead process
+                    # would poison the pool with guaranteed failures.
+                    logger.warning(f"Festival worker failed, respawning: {e}")
+                    try:
+                        worker.kill()
+                    except ProcessLookupError:
+                        pass
+                    if worker in self._festival_pool:
+                        self._festival_pool.remove(worker)
+                    try:
+                        replacement = await self._spawn_festival_worker()
+                    except Exception as spawn_error:
+                        # Slot stays out of the queue; once the last
+                        # worker is gone, disable the pool so synthesis
+                        # drops to the per-call subprocess path
+                        logger.warning(f"Festival worker respawn failed: {spawn_error}")
+                        if not self._festival_pool:
+                            self._festival_queue = None
+                    else:
+                        self._festival_pool.append(replacement)
+                        self._festival_queue.put_nowait(replacement)
+                    raise
+            else:
+                # Run Festival without blocking the event loop
+                proc = await asyncio.create_subprocess_exec(
+                    "festival",
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+
+                _, stderr = await proc.communicate(festival_script.encode())
+
+                if proc.returncode != 0:
+                    raise Exception(f"Festival failed: {stderr.decode(errors='replace')}")
+
+            # Read the audio file back
             with open(temp_path, "rb") as audio_file:
                 audio_bytes = audio_file.read()
-                audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-            
+
             # Clean up
             os.unlink(temp_path)
-            
-            return audio_base64
-            
+
+            return audio_bytes
+
         except Exception as e:
             logger.error(f"Festival synthesis failed: {e}")
             raise
     
-    async def _synthesize_simple(self, text: str) -> str:
+    async def _synthesize_simple(self, text: str) -> bytes:
         """Simple TTS fallback (returns empty audio)"""
         logger.warning("Using simple TTS fallback - no actual audio generated")
-        
-        # Create a simple silent audio file
-        # This is a placeholder - in a real implementation, you might use 
+
+        # This is a placeholder - in a real implementation, you might use
         # pyttsx3 or gTTS with offline capabilities
-        
-        silent_audio = b'\x00' * 1024  # 1KB of silence
-        return base64.b64encode(silent_audio).decode('utf-8')
+
+        return _SILENT_WAV
     
-    def _adjust_emotion_parameters(self, emotion: str) -> Dict[str, float]:
-        """Adjust TTS parameters based on emotion"""
-        
-        emotion_params = {
-            "happy": {"speed": 1.1, "pitch": 1.2},
-            "sad": {"speed": 0.8, "pitch": 0.8},
-            "angry": {"speed": 1.2, "pitch": 1.1},
-            "fear": {"speed": 1.1, "pitch": 1.3},
-            "neutral": {"speed": 1.0, "pitch": 1.0},
-            "surprise": {"speed": 1.2, "pitch": 1.4},
-            "disgust": {"speed": 0.9, "pitch": 0.9}
-        }
-        
-        return emotion_params.get(emotion, emotion_params["neutral"])
+    def _adjust_emotion_parameters(self, emotion: str) -> Tuple[float, float]:
+        """(speed, pitch) multipliers for an emotional tone"""
+        return _EMOTION_PARAMS.get(emotion, _DEFAULT_PARAMS)
     
-    async def health_check(self) -> Dict[str, Any]:
-        """Check service health"""
-        return {
+    def _refresh_health_cache(self):
+        """Rebuild the memoized health payload after a state transition"""
+        self._health_cache = {
             "status": "ready" if self.available_engines else "not_ready",
             "available_engines": self.available_engines,
             "default_engine": self.default_engine
         }
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Check service health"""
+        if self._health_cache is None:
+            self._refresh_health_cache()
+        return self._health_cache
     
     def get_model_status(self) -> ModelStatus:
         """Get model status"""
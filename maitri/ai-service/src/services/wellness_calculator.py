@@ -1,10 +1,55 @@
+import bisect
 import numpy as np
+import time
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from loguru import logger
 
 from ..models.schemas import WellnessResponse
 
+# C-extension ISO parser when available; it accepts the 'Z' suffix
+# natively so no per-record string replacement is needed
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    def _parse_iso(value: str) -> datetime:
+        # fromisoformat before Python 3.11 rejects a trailing 'Z'
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# JIT-compiled fused reduction when numba is installed: one machine-code
+# loop produces all emotion-derived sums without the intermediate arrays
+# the NumPy expressions allocate. Without numba the NumPy path in
+# _compute_scores_fused is used unchanged.
+try:
+    from numba import njit as _njit
+
+    @_njit(cache=True, fastmath=True)
+    def _fused_reduce(codes, conf, weight_arr, energy_arr, high_bits, positive_bits):
+        weighted = 0.0
+        total_conf = 0.0
+        stress_sum = 0.0
+        energy_sum = 0.0
+        for i in range(codes.shape[0]):
+            c = codes[i]
+            w = conf[i]
+            weighted += weight_arr[c] * w
+            total_conf += w
+            if (high_bits >> c) & 1:
+                stress_sum += w
+            elif (positive_bits >> c) & 1:
+                stress_sum += 0.1
+            else:
+                stress_sum += 0.3
+            energy_sum += energy_arr[c]
+        return weighted, total_conf, stress_sum, energy_sum
+
+except ImportError:
+    _fused_reduce = None
+
+def _clamp01(value: float) -> float:
+    """Clamp a scalar to [0, 1] without np.clip's 0-d array round trip"""
+    return 0.0 if value < 0.0 else (1.0 if value > 1.0 else value)
+
 class WellnessCalculator:
     """Service for calculating wellness scores and detecting stress patterns"""
     
@@ -24,6 +69,102 @@ class WellnessCalculator:
             "low_energy_emotions": ["sad", "neutral"],
             "positive_emotions": ["happy", "surprise"]
         }
+
+        # Vectorized mirrors of the tables above: emotions map to small
+        # integer codes once, then every score is a fancy-index plus one
+        # C-level reduction instead of a Python loop over dicts. The last
+        # slot is the unknown-emotion fallback.
+        emotions = tuple(self.emotion_weights)
+        self._emotion_codes = {e: i for i, e in enumerate(emotions)}
+        self._unknown_code = len(emotions)
+        self._weight_arr = np.array(
+            [self.emotion_weights[e] for e in emotions] + [0.5], dtype=np.float32
+        )
+        # Category membership packed into one integer bitmask per set:
+        # testing a code array is a shift-and-AND instead of a hashed
+        # membership probe or a boolean-table gather
+        high_stress = set(self.stress_indicators["high_stress_emotions"])
+        positive = set(self.stress_indicators["positive_emotions"])
+        self._high_stress_bits = 0
+        self._positive_bits = 0
+        for emotion, code in self._emotion_codes.items():
+            if emotion in high_stress:
+                self._high_stress_bits |= 1 << code
+            if emotion in positive:
+                self._positive_bits |= 1 << code
+        self._energy_arr = np.array(
+            [
+                0.8 if e in ("happy", "surprise", "angry")
+                else 0.3 if e in ("sad", "fear")
+                else 0.5
+                for e in emotions
+            ] + [0.5],
+            dtype=np.float32
+        )
+
+        # Recommendation buckets quantized per dimension: each score maps
+        # to a level (0 low, 1 mid, 2 high) against its own thresholds and
+        # pulls an immutable tuple, replacing branchy list building
+        self._reco_thresholds = {
+            "stress": (0.5, 0.7),
+            "energy": (0.3, 0.8),
+            "emotional": (0.4, 0.8),
+            "physical": (0.4, 1.1),
+        }
+        self._reco_buckets = {
+            ("stress", 2): (
+                "Practice deep breathing exercises",
+                "Take regular breaks to reduce stress",
+                "Consider mindfulness meditation"
+            ),
+            ("stress", 1): (
+                "Monitor your stress levels and practice relaxation techniques",
+            ),
+            ("energy", 0): (
+                "Ensure you're getting adequate sleep",
+                "Take short walks to boost energy",
+                "Stay hydrated throughout the day"
+            ),
+            ("energy", 2): (
+                "Channel your high energy into productive activities",
+            ),
+            ("emotional", 0): (
+                "Reach out to friends or family for support",
+                "Engage in activities you enjoy",
+                "Consider speaking with a counselor if feelings persist"
+            ),
+            ("emotional", 2): (
+                "Keep doing what makes you happy!",
+            ),
+            ("physical", 0): (
+                "Ensure you're maintaining good posture",
+                "Take breaks from screen time",
+                "Consider light physical exercise"
+            ),
+        }
+
+        # Pay the numba compile (or on-disk cache load) at construction
+        # rather than on the first request; a broken build drops this
+        # instance back to the NumPy path
+        self._fused_kernel = _fused_reduce
+        if self._fused_kernel is not None:
+            try:
+                self._fused_kernel(
+                    np.zeros(1, dtype=np.int16), np.zeros(1, dtype=np.float32),
+                    self._weight_arr, self._energy_arr,
+                    self._high_stress_bits, self._positive_bits
+                )
+            except Exception as e:
+                logger.warning(f"Fused wellness kernel unavailable, using NumPy path: {e}")
+                self._fused_kernel = None
+
+        # The calculator has no runtime state transitions, so the health
+        # payload is fixed at construction
+        self._health_cache = {
+            "status": "ready",
+            "emotion_weights_loaded": len(self.emotion_weights) > 0,
+            "stress_indicators_loaded": len(self.stress_indicators) > 0
+        }
     
     def calculate_wellness_score(
         self,
@@ -43,11 +184,10 @@ class WellnessCalculator:
             if not recent_emotions:
                 return self._default_wellness_response()
             
-            # Calculate component scores
-            emotional_score = self._calculate_emotional_score(recent_emotions)
-            physical_score = self._calculate_physical_score(recent_emotions)
-            stress_score = self._calculate_stress_score(recent_emotions)
-            energy_score = self._calculate_energy_score(recent_emotions)
+            # Calculate all component scores from one pass over the records
+            emotional_score, physical_score, stress_score, energy_score = (
+                self._compute_scores_fused(recent_emotions)
+            )
             
             # Calculate overall score
             overall_score = (
@@ -64,11 +204,11 @@ class WellnessCalculator:
             )
             
             return WellnessResponse(
-                overall=float(np.clip(overall_score, 0, 1)),
-                emotional=float(np.clip(emotional_score, 0, 1)),
-                physical=float(np.clip(physical_score, 0, 1)),
-                stress=float(np.clip(stress_score, 0, 1)),
-                energy=float(np.clip(energy_score, 0, 1)),
+                overall=_clamp01(overall_score),
+                emotional=_clamp01(emotional_score),
+                physical=_clamp01(physical_score),
+                stress=_clamp01(stress_score),
+                energy=_clamp01(energy_score),
                 trends=trends,
                 recommendations=recommendations
             )
@@ -84,48 +224,145 @@ class WellnessCalculator:
     ) -> List[Dict[str, Any]]:
         """Filter emotions within the specified time window"""
         
-        current_time = datetime.now()
-        cutoff_time = current_time - timedelta(seconds=time_window)
-        
+        # One epoch cutoff; comparing via .timestamp() works for both
+        # naive and timezone-aware records, where a datetime comparison
+        # against a naive cutoff would raise on aware timestamps
+        cutoff_ts = time.time() - time_window
+
+        # Chronologically ordered histories (the common case for an
+        # append-only log) take a bisect to the cutoff index. Sortedness
+        # is verified over the full epoch sequence first — the endpoint
+        # accepts arbitrary client-supplied histories, and bisecting an
+        # unsorted list silently returns a wrong boundary. The check is
+        # one pass over floats that _coerce_ts caches on the records, so
+        # repeat calls never re-parse. Any parse failure or out-of-order
+        # history falls back to the linear scan below.
+        if len(emotion_history) >= 2:
+            try:
+                epochs = [self._coerce_ts(e) for e in emotion_history]
+            except Exception:
+                epochs = None
+            if epochs is not None and all(
+                epochs[i] <= epochs[i + 1] for i in range(len(epochs) - 1)
+            ):
+                i = bisect.bisect_left(epochs, cutoff_ts)
+                return emotion_history[i:]
+
         recent_emotions = []
         for emotion_data in emotion_history:
             try:
-                timestamp = emotion_data.get('timestamp')
-                if isinstance(timestamp, str):
-                    timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                elif isinstance(timestamp, datetime):
-                    pass
-                else:
-                    continue  # Skip invalid timestamps
-                
-                if timestamp >= cutoff_time:
+                if self._coerce_ts(emotion_data) >= cutoff_ts:
                     recent_emotions.append(emotion_data)
-                    
             except Exception:
                 continue  # Skip invalid entries
-        
+
         return recent_emotions
-    
+
+    @staticmethod
+    def _coerce_ts(emotion_data: Dict[str, Any]) -> float:
+        """Epoch seconds for a record's timestamp, parsed at most once.
+
+        The float is written back to the record as '_ts_epoch', so
+        repeated filters over the same (or a caller-retained) history
+        compare plain floats instead of re-parsing ISO strings every
+        call. Callers that already produce epoch timestamps skip the
+        parse entirely. Raises when the timestamp is invalid.
+        """
+        ts = emotion_data.get('_ts_epoch')
+        if ts is not None:
+            return ts
+        timestamp = emotion_data.get('timestamp')
+        if isinstance(timestamp, str):
+            ts = _parse_iso(timestamp).timestamp()
+        elif isinstance(timestamp, datetime):
+            ts = timestamp.timestamp()
+        elif isinstance(timestamp, (int, float)):
+            ts = float(timestamp)
+        else:
+            raise ValueError("invalid timestamp")
+        emotion_data['_ts_epoch'] = ts
+        return ts
+
+    def _vectorize(self, emotions: List[Dict[str, Any]]) -> tuple:
+        """Extract (emotion-code, confidence) arrays for NumPy scoring"""
+        n = len(emotions)
+        codes = np.fromiter(
+            (
+                self._emotion_codes.get(e.get('emotion', 'neutral'), self._unknown_code)
+                for e in emotions
+            ),
+            dtype=np.int16, count=n
+        )
+        conf = np.fromiter(
+            (e.get('confidence', 0.5) for e in emotions),
+            dtype=np.float32, count=n
+        )
+        return codes, conf
+
+    def _compute_scores_fused(self, emotions: List[Dict[str, Any]]) -> tuple:
+        """Compute the four sub-scores from a single walk over the records.
+
+        Each record's dicts and optional fields are touched once; the four
+        reductions then run over the same extracted arrays instead of four
+        separate traversals of the Python objects.
+        """
+        codes, conf = self._vectorize(emotions)
+
+        # Optional per-record fields gathered in the same walk
+        audio_sum = 0.0
+        audio_count = 0
+        physical_sum = 0.0
+        physical_count = 0
+        for emotion_data in emotions:
+            if emotion_data.get('facial_landmarks'):
+                physical_sum += 0.7  # Placeholder, as in _calculate_physical_score
+                physical_count += 1
+            audio_features = emotion_data.get('audio_features')
+            if audio_features:
+                energy = audio_features.get('energy', 0.5)
+                physical_sum += min(energy * 2, 1.0)
+                physical_count += 1
+                audio_sum += energy
+                audio_count += 1
+
+        physical = physical_sum / physical_count if physical_count else 0.6
+
+        if self._fused_kernel is not None and codes.size:
+            weighted, total_weight, stress_sum, emotion_energy = self._fused_kernel(
+                codes, conf, self._weight_arr, self._energy_arr,
+                self._high_stress_bits, self._positive_bits
+            )
+            emotional = weighted / total_weight if total_weight > 0 else 0.5
+            stress = stress_sum / codes.size
+        else:
+            total_weight = float(conf.sum())
+            emotional = (
+                float((self._weight_arr[codes] * conf).sum()) / total_weight
+                if total_weight > 0 else 0.5
+            )
+            stress = float(np.where(
+                (self._high_stress_bits >> codes) & 1, conf,
+                np.where((self._positive_bits >> codes) & 1, np.float32(0.1), np.float32(0.3))
+            ).mean()) if codes.size else 0.3
+            emotion_energy = float(self._energy_arr[codes].sum())
+
+        energy_total = emotion_energy + audio_sum
+        energy_count = codes.size + audio_count
+        energy = energy_total / energy_count if energy_count else 0.5
+
+        return emotional, physical, stress, energy
+
     def _calculate_emotional_score(self, emotions: List[Dict[str, Any]]) -> float:
         """Calculate emotional wellness score"""
-        
+
         if not emotions:
             return 0.5
-        
-        total_score = 0
-        total_weight = 0
-        
-        for emotion_data in emotions:
-            emotion = emotion_data.get('emotion', 'neutral')
-            confidence = emotion_data.get('confidence', 0.5)
-            
-            emotion_weight = self.emotion_weights.get(emotion, 0.5)
-            weighted_score = emotion_weight * confidence
-            
-            total_score += weighted_score
-            total_weight += confidence
-        
-        return total_score / total_weight if total_weight > 0 else 0.5
+
+        codes, conf = self._vectorize(emotions)
+        weights = self._weight_arr[codes]
+        total_weight = float(conf.sum())
+
+        return float((weights * conf).sum()) / total_weight if total_weight > 0 else 0.5
     
     def _calculate_physical_score(self, emotions: List[Dict[str, Any]]) -> float:
         """Calculate physical wellness score based on facial and audio indicators"""
@@ -160,62 +397,61 @@ class WellnessCalculator:
         
         if not emotions:
             return 0.3
-        
-        stress_indicators = []
-        
-        for emotion_data in emotions:
-            emotion = emotion_data.get('emotion', 'neutral')
-            confidence = emotion_data.get('confidence', 0.5)
-            
-            if emotion in self.stress_indicators["high_stress_emotions"]:
-                stress_indicators.append(confidence)
-            elif emotion in self.stress_indicators["positive_emotions"]:
-                stress_indicators.append(0.1)
-            else:
-                stress_indicators.append(0.3)
-        
-        return np.mean(stress_indicators)
+
+        codes, conf = self._vectorize(emotions)
+        contributions = np.where(
+            (self._high_stress_bits >> codes) & 1, conf,
+            np.where((self._positive_bits >> codes) & 1, np.float32(0.1), np.float32(0.3))
+        )
+
+        return float(contributions.mean())
     
     def _calculate_energy_score(self, emotions: List[Dict[str, Any]]) -> float:
         """Calculate energy level"""
         
         if not emotions:
             return 0.5
-        
-        energy_indicators = []
-        
+
+        # Emotion-based component vectorized; audio energies are optional
+        # per record so they accumulate in the same walk as _vectorize's
+        codes, _ = self._vectorize(emotions)
+        emotion_energy = self._energy_arr[codes]
+
+        audio_sum = 0.0
+        audio_count = 0
         for emotion_data in emotions:
-            emotion = emotion_data.get('emotion', 'neutral')
-            confidence = emotion_data.get('confidence', 0.5)
-            
-            # Audio features can indicate energy level
             audio_features = emotion_data.get('audio_features')
             if audio_features:
-                audio_energy = audio_features.get('energy', 0.5)
-                energy_indicators.append(audio_energy)
-            
-            # Emotion-based energy estimation
-            if emotion in ["happy", "surprise", "angry"]:
-                energy_indicators.append(0.8)
-            elif emotion in ["sad", "fear"]:
-                energy_indicators.append(0.3)
-            else:
-                energy_indicators.append(0.5)
-        
-        return np.mean(energy_indicators) if energy_indicators else 0.5
+                audio_sum += audio_features.get('energy', 0.5)
+                audio_count += 1
+
+        total = float(emotion_energy.sum()) + audio_sum
+        count = emotion_energy.size + audio_count
+
+        return total / count if count else 0.5
     
     def _analyze_trends(self, emotion_history: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze wellness trends over time"""
         
         if len(emotion_history) < 2:
             return {"trend": "insufficient_data"}
-        
-        # Simple trend analysis - compare recent vs older emotions
-        recent_emotions = emotion_history[:len(emotion_history)//2]
-        older_emotions = emotion_history[len(emotion_history)//2:]
-        
-        recent_score = self._calculate_emotional_score(recent_emotions)
-        older_score = self._calculate_emotional_score(older_emotions)
+
+        # Simple trend analysis - compare recent vs older emotions. One
+        # pass routes each record's weight*confidence into the recent or
+        # older accumulator by index, instead of slicing the history into
+        # two lists and scoring each with its own loop.
+        mid = len(emotion_history) // 2
+        sums = [0.0, 0.0]   # weighted emotion sums: recent, older
+        totals = [0.0, 0.0]  # confidence totals: recent, older
+        weights = self.emotion_weights
+        for i, emotion_data in enumerate(emotion_history):
+            half = 0 if i < mid else 1
+            confidence = emotion_data.get('confidence', 0.5)
+            sums[half] += weights.get(emotion_data.get('emotion', 'neutral'), 0.5) * confidence
+            totals[half] += confidence
+
+        recent_score = sums[0] / totals[0] if totals[0] > 0 else 0.5
+        older_score = sums[1] / totals[1] if totals[1] > 0 else 0.5
         
         trend_direction = "stable"
         if recent_score > older_score + 0.1:
@@ -238,47 +474,23 @@ class WellnessCalculator:
         energy: float
     ) -> List[str]:
         """Generate personalized wellness recommendations"""
-        
+
+        # Quantize each score against its dimension's thresholds and pull
+        # the matching precomputed bucket; (dimension, level) pairs with
+        # no bucket contribute nothing. Order matches the old branches.
         recommendations = []
-        
-        # Stress-based recommendations
-        if stress > 0.7:
-            recommendations.extend([
-                "Practice deep breathing exercises",
-                "Take regular breaks to reduce stress",
-                "Consider mindfulness meditation"
-            ])
-        elif stress > 0.5:
-            recommendations.append("Monitor your stress levels and practice relaxation techniques")
-        
-        # Energy-based recommendations
-        if energy < 0.3:
-            recommendations.extend([
-                "Ensure you're getting adequate sleep",
-                "Take short walks to boost energy",
-                "Stay hydrated throughout the day"
-            ])
-        elif energy > 0.8:
-            recommendations.append("Channel your high energy into productive activities")
-        
-        # Emotional recommendations
-        if emotional < 0.4:
-            recommendations.extend([
-                "Reach out to friends or family for support",
-                "Engage in activities you enjoy",
-                "Consider speaking with a counselor if feelings persist"
-            ])
-        elif emotional > 0.8:
-            recommendations.append("Keep doing what makes you happy!")
-        
-        # Physical recommendations
-        if physical < 0.4:
-            recommendations.extend([
-                "Ensure you're maintaining good posture",
-                "Take breaks from screen time",
-                "Consider light physical exercise"
-            ])
-        
+        for dimension, value in (
+            ("stress", stress),
+            ("energy", energy),
+            ("emotional", emotional),
+            ("physical", physical),
+        ):
+            low, high = self._reco_thresholds[dimension]
+            level = (value > low) + (value > high)
+            bucket = self._reco_buckets.get((dimension, level))
+            if bucket:
+                recommendations.extend(bucket)
+
         # Limit to 5 recommendations
         return recommendations[:5] if recommendations else ["Keep monitoring your wellness"]
     
@@ -346,8 +558,4 @@ class WellnessCalculator:
     
     def health_check(self) -> Dict[str, Any]:
         """Check service health"""
-        return {
-            "status": "ready",
-            "emotion_weights_loaded": len(self.emotion_weights) > 0,
-            "stress_indicators_loaded": len(self.stress_indicators) > 0
-        }
\ No newline at end of file
+        return self._health_cache
\ No newline at end of file
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+from src.services.emotion_detection import EmotionDetectionService
+
+def test_classify_emotion_through_scheduler():
+    """Smoke-test _classify_emotion on the batch-scheduler path.
+
+    app.py starts the scheduler unconditionally, so this is the shape the
+    production path sees: the scheduler resolves each submit() to a 1-D
+    (num_classes,) slice of the batched output.
+    """
+
+    async def scenario():
+        service = EmotionDetectionService()
+        await service.initialize()
+        service.start_batch_scheduler()
+        try:
+            face = torch.zeros(
+                1, 1, 48, 48, device=service.device, dtype=service.model_dtype
+            ).contiguous(memory_format=torch.channels_last)
+
+            # Concurrent submissions so at least one call batches
+            results = await asyncio.gather(
+                service._classify_emotion(face),
+                service._classify_emotion(face),
+            )
+        finally:
+            await service.stop_batch_scheduler()
+        return results
+
+    for result in asyncio.run(scenario()):
+        assert result.emotion in EmotionDetectionService.EMOTIONS
+        assert 0.0 <= result.confidence <= 1.0
+        assert result.probabilities.shape == (len(EmotionDetectionService.EMOTIONS),)
+
+def test_classify_emotion_without_scheduler():
+    """The eager fallback path must agree on the 1-D result shape."""
+
+    async def scenario():
+        service = EmotionDetectionService()
+        await service.initialize()
+        face = torch.zeros(
+            1, 1, 48, 48, device=service.device, dtype=service.model_dtype
+        ).contiguous(memory_format=torch.channels_last)
+        return await service._classify_emotion(face)
+
+    result = asyncio.run(scenario())
+    assert result.emotion in EmotionDetectionService.EMOTIONS
+    assert result.probabilities.shape == (len(EmotionDetectionService.EMOTIONS),)